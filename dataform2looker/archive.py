@@ -0,0 +1,66 @@
+"""Writing of generated LookML view files into a single archive file."""  # noqa: E501
+
+import contextlib
+import gzip
+import io
+import logging
+import tarfile
+import zipfile
+
+from dataform2looker.exceptions import UnsupportedArchiveFormatError
+
+_TAR_COMPRESSIONS = {
+    ".tar": False,
+    ".tar.gz": True,
+    ".tgz": True,
+}
+
+
+def write_archive(archive_path: str, files: dict[str, str]) -> None:
+    """Streams view files into a single zip or tar archive.
+
+    The format is chosen from the extension of `archive_path`. Every member,
+    and the gzip header of compressed tar archives, gets the same fixed
+    timestamp so identical views produce identical archives.
+
+    Args:
+        archive_path: The path of the archive, ending in ".zip", ".tar", ".tar.gz" or ".tgz".
+        files: A dictionary mapping the file names to their content.
+
+    Raises:
+        UnsupportedArchiveFormatError: If the extension of `archive_path` is not supported.
+    """  # noqa: E501
+    if archive_path.endswith(".zip"):
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for file_name, content in files.items():
+                member = zipfile.ZipInfo(file_name)
+                member.compress_type = zipfile.ZIP_DEFLATED
+                member.external_attr = 0o644 << 16
+                archive.writestr(member, content)
+    else:
+        gzipped = next(
+            (
+                compressed
+                for extension, compressed in _TAR_COMPRESSIONS.items()
+                if archive_path.endswith(extension)
+            ),
+            None,
+        )
+        if gzipped is None:
+            raise UnsupportedArchiveFormatError(
+                archive_path, [".zip", *_TAR_COMPRESSIONS.keys()]
+            )
+        with contextlib.ExitStack() as stack:
+            fileobj = stack.enter_context(open(archive_path, "wb"))
+            if gzipped:
+                # The gzip header gets no file name and a fixed timestamp
+                fileobj = stack.enter_context(
+                    gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0)
+                )
+            archive = stack.enter_context(tarfile.open(fileobj=fileobj, mode="w"))
+            for file_name, content in files.items():
+                data = content.encode("utf-8")
+                member = tarfile.TarInfo(file_name)
+                member.size = len(data)
+                archive.addfile(member, io.BytesIO(data))
+    logging.debug(f"Created archive {archive_path} with {len(files)} files")
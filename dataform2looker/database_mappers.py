@@ -5,10 +5,12 @@ import logging
 from google.cloud import bigquery
 
 from dataform2looker.exceptions import (
+    InvalidDescriptionPrecedenceError,
     InvalidFieldTypeError,
     TableNotFoundError,
     UnsupportedDatabaseTypeError,
 )
+from dataform2looker.schema_cache import FreshnessProbe, SchemaCache
 
 
 class Column:
@@ -80,6 +82,38 @@ class Column:
             self.column_dictionary["timeframes"] = self.time_frames
 
 
+class BigQueryFreshnessProbe:
+    """Lists the last modification time of all the tables of a BigQuery dataset.
+
+    Uses the `__TABLES__` meta-table, so a single query returns the version of
+    every table of the dataset without downloading any schema.
+    """  # noqa: E501
+
+    def __init__(self, client: bigquery.Client) -> None:
+        """Initializes the `BigQueryFreshnessProbe` object.
+
+        Args:
+            client: The BigQuery client used to query the datasets.
+        """  # noqa: E501
+        self.__client = client
+
+    def get_table_versions(self, dataset_id: str) -> dict[str, str]:
+        """Returns the last modification time of every table of a dataset.
+
+        Args:
+            dataset_id: The full ID of the dataset (e.g., "project.dataset").
+
+        Returns:
+            dict[str, str]: A dictionary mapping the table names to their last
+                modification time, in milliseconds since the epoch.
+        """  # noqa: E501
+        rows = self.__client.query(
+            f"SELECT table_id, last_modified_time FROM `{dataset_id}.__TABLES__`"
+        ).result()
+        logging.debug(f"Probed table versions of dataset {dataset_id}")
+        return {row["table_id"]: str(row["last_modified_time"]) for row in rows}
+
+
 class BigQueryTable:
     """Base Table class for representing BigQuery tables and their column information.
 
@@ -89,10 +123,16 @@ class BigQueryTable:
         columns (list[Column]): A list of `Column` objects representing the table's columns.
 
     Methods:
-        __init__(self, table_id: str) -> None:
+        __init__(self, table_id: str, client: bigquery.Client = None, schema_cache: SchemaCache = None) -> None:
             Initializes the `BigqueryTable` object by setting the `table_id` and `table_name`,
             and retrieving the column information using `__get_columns()`.
 
+        create_client() -> bigquery.Client:
+            Creates a BigQuery client that can be shared between tables.
+
+        create_freshness_probe(client: bigquery.Client) -> BigQueryFreshnessProbe:
+            Creates a probe listing the versions of the tables of a dataset.
+
         __get_columns(self) -> list[Column]:
             Retrieves and structures column information from the BigQuery table.
 
@@ -143,32 +183,86 @@ class BigQueryTable:
         "DATE": ["raw", "date", "week", "month", "quarter", "year"],
     }
 
-    def __init__(self, table_id: str) -> None:
+    def __init__(
+        self,
+        table_id: str,
+        client: bigquery.Client = None,
+        schema_cache: SchemaCache = None,
+    ) -> None:
         """Initializes the `BigqueryTable` object.
 
         Args:
             table_id: The full ID of the BigQuery table (e.g., "project.dataset.table").
+            client: A BigQuery client to reuse, a new one is created if not provided.
+            schema_cache: A cache of the schemas, used when the schema of the table is fresh.
 
         Sets the `table_id` and `table_name` attributes, and retrieves column information
         using the `__get_columns()` method.
         """  # noqa: E501
         self.table_id = table_id
         self.table_name = table_id.split(".")[-1]
+        self.__client = client
+        self.__schema_cache = schema_cache
         self.columns = self.__get_columns()
 
+    @staticmethod
+    def create_client() -> bigquery.Client:
+        """Creates a BigQuery client that can be shared between tables.
+
+        Returns:
+            bigquery.Client: A BigQuery client using the default credentials.
+        """  # noqa: E501
+        return bigquery.Client()
+
+    @staticmethod
+    def create_freshness_probe(client: bigquery.Client) -> BigQueryFreshnessProbe:
+        """Creates a probe listing the versions of the tables of a dataset.
+
+        Args:
+            client: The BigQuery client used to query the datasets.
+
+        Returns:
+            BigQueryFreshnessProbe: The probe for the schema cache.
+        """  # noqa: E501
+        return BigQueryFreshnessProbe(client)
+
     def __get_columns(self) -> list[Column]:
         """Retrieves and structures column information from a BigQuery table.
 
         This method connects to BigQuery, fetches the schema of the table identified by `self.table_id`,
         and constructs a list of `Column` objects representing each field in the table.
-
-        Raises:
-            TableNotFoundError: If the table is not found or cannot be retrieved.
+        The schema is read from the schema cache instead when it is fresh.
 
         Returns:
             list[Column]: A list of `Column` objects, each representing a column in the BigQuery table.
         """  # noqa: E501
-        client = bigquery.Client()
+        fields = self.__schema_cache.get(self.table_id) if self.__schema_cache else None
+        if fields is not None:
+            logging.debug(f"Got cached table schema from table {self.table_id}")
+        else:
+            fields = self.__fetch_fields()
+        columns = [
+            Column(
+                name=field["name"],
+                description=field["description"],
+                field_type=self._LOOKER_TYPE_MAP[field["field_type"]],
+                data_type=field["field_type"].lower(),
+                time_frames=self._TIME_FRAMES_MAP.get(field["field_type"], None),
+            )
+            for field in fields
+        ]
+        return columns
+
+    def __fetch_fields(self) -> list[dict]:
+        """Fetches the schema of the BigQuery table and stores it in the schema cache.
+
+        Returns:
+            list[dict]: The "name", "description" and "field_type" of each field of the table.
+
+        Raises:
+            TableNotFoundError: If the table is not found or cannot be retrieved.
+        """  # noqa: E501
+        client = self.__client or self.create_client()
         try:
             table = client.get_table(self.table_id)
         except Exception as e:
@@ -176,17 +270,17 @@ class BigQueryTable:
             raise TableNotFoundError(self.table_id) from e
 
         logging.debug(f"Got table schema from table {self.table_id}")
-        columns = [
-            Column(
-                name=field.name,
-                description=field.description,
-                field_type=self._LOOKER_TYPE_MAP[field.field_type],
-                data_type=field.field_type.lower(),
-                time_frames=self._TIME_FRAMES_MAP.get(field.field_type, None),
-            )
+        fields = [
+            {
+                "name": field.name,
+                "description": field.description,
+                "field_type": field.field_type,
+            }
             for field in table.schema
         ]
-        return columns
+        if self.__schema_cache:
+            self.__schema_cache.put(self.table_id, fields)
+        return fields
 
 
 class GenericTable:
@@ -197,12 +291,22 @@ class GenericTable:
         table_name (str): The name of the table (extracted from `table_id`).
         dimensions (list[dict]): A list of dictionaries representing dimensions in the table.
         dimension_group (list[dict]): A list of dictionaries representing time dimension groups.
+        DESCRIPTION_PRECEDENCES (list[str]): The supported precedences of `apply_descriptions`.
 
     Methods:
-        __init__(self, table_id: str, db_type: str) -> None:
+        __init__(self, table_id: str, db_type: str, client: object = None, schema_cache: SchemaCache = None) -> None:
             Initializes the `GenericTable` object based on the `db_type`.
             Uses a factory pattern to dynamically load the correct mapper.
 
+        create_client(db_type: str) -> object:
+            Creates a database client for `db_type` that can be shared between tables.
+
+        create_freshness_probe(db_type: str, client: object) -> FreshnessProbe:
+            Creates a probe listing the versions of the tables of a dataset.
+
+        apply_descriptions(self, descriptions: dict[str, str], precedence: str) -> None:
+            Merges column descriptions from another source into the dimensions.
+
     Raises:
         UnsupportedDatabaseTypeError: If an unsupported `db_type` is provided.
     """  # noqa: E501
@@ -211,12 +315,22 @@ class GenericTable:
         "bigquery": BigQueryTable,
     }
 
-    def __init__(self, table_id: str, db_type: str = "bigquery") -> None:
+    DESCRIPTION_PRECEDENCES = ["dataform", "bigquery"]
+
+    def __init__(
+        self,
+        table_id: str,
+        db_type: str = "bigquery",
+        client: object = None,
+        schema_cache: SchemaCache = None,
+    ) -> None:
         """Initializes the `GenericTable` object based on the database type.
 
         Args:
             table_id: The full ID of the table in the database.
             db_type: The type of the database ("bigquery" currently supported).
+            client: A database client to reuse, the mapper creates one if not provided.
+            schema_cache: A cache of the schemas, used when the schema of the table is fresh.
 
         Raises:
             UnsupportedDatabaseTypeError: If an unsupported `db_type` is provided.
@@ -225,7 +339,7 @@ class GenericTable:
         if not mapper_class:
             raise UnsupportedDatabaseTypeError(db_type)
 
-        self.__table = mapper_class(table_id)
+        self.__table = mapper_class(table_id, client, schema_cache)
         self.table_id = table_id
         self.table_name = self.__table.table_name
         self.__db_type = db_type
@@ -263,3 +377,70 @@ class GenericTable:
                 "measures": self.measures,
             }
         }
+
+    def apply_descriptions(
+        self, descriptions: dict[str, str], precedence: str = "dataform"
+    ) -> None:
+        """Merges column descriptions from the Dataform graph into the dimensions.
+
+        Each dimension looks up its own description by column path, so the cost is
+        proportional to the number of columns whatever the size of `descriptions`.
+
+        Args:
+            descriptions: A dictionary mapping the column paths of the table to their Dataform description.
+            precedence: The description used when both are set, "dataform" or "bigquery".
+                The other description is used when the preferred one is empty.
+
+        Raises:
+            InvalidDescriptionPrecedenceError: If an unsupported `precedence` is provided.
+        """  # noqa: E501
+        if precedence not in self.DESCRIPTION_PRECEDENCES:
+            raise InvalidDescriptionPrecedenceError(
+                precedence, self.DESCRIPTION_PRECEDENCES
+            )
+        if not descriptions:
+            return
+        prefer_dataform = precedence == "dataform"
+        for dimension in [*self.dimensions, *self.dimension_group]:
+            dataform_description = descriptions.get(dimension["name"])
+            if dataform_description and (
+                prefer_dataform or not dimension["description"]
+            ):
+                dimension["description"] = dataform_description
+
+    @classmethod
+    def create_client(cls, db_type: str = "bigquery") -> object:
+        """Creates a database client that can be shared between tables.
+
+        Args:
+            db_type: The type of the database ("bigquery" currently supported).
+
+        Returns:
+            object: A client for the database, as expected by the mapper of `db_type`.
+
+        Raises:
+            UnsupportedDatabaseTypeError: If an unsupported `db_type` is provided.
+        """  # noqa: E501
+        mapper_class = cls._MAPPERS.get(db_type)
+        if not mapper_class:
+            raise UnsupportedDatabaseTypeError(db_type)
+        return mapper_class.create_client()
+
+    @classmethod
+    def create_freshness_probe(cls, db_type: str, client: object) -> FreshnessProbe:
+        """Creates a probe listing the versions of the tables of a dataset.
+
+        Args:
+            db_type: The type of the database ("bigquery" currently supported).
+            client: A client for the database, as created by `create_client`.
+
+        Returns:
+            FreshnessProbe: The probe for the schema cache.
+
+        Raises:
+            UnsupportedDatabaseTypeError: If an unsupported `db_type` is provided.
+        """  # noqa: E501
+        mapper_class = cls._MAPPERS.get(db_type)
+        if not mapper_class:
+            raise UnsupportedDatabaseTypeError(db_type)
+        return mapper_class.create_freshness_probe(client)
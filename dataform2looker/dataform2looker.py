@@ -1,36 +1,161 @@
 """CLI script for generating LookML view files from Dataform models."""
 
 import argparse
+import json
 import logging
 import subprocess
 import sys
 from collections.abc import Sequence
 from pathlib import Path
 
+from dataform2looker.exceptions import IncompleteShardsError
 from dataform2looker.lookml import LookML
+from dataform2looker.profiling import Profiler
+from dataform2looker.render_cache import RenderCache
+from dataform2looker.server import GeneratorServer
+from dataform2looker.sharding import MANIFEST_PREFIX, merge_shard_manifests
 
 
-def _generate_view(path_to_json_file: str, target_dir: str, tags: set[str]) -> int:
+def _generate_view(
+    path_to_json_file: str,
+    target_dir: str,
+    tags: set[str],
+    shard_index: int = 0,
+    shard_count: int = 1,
+    dry_run: bool = False,
+    bundle_by: str | None = None,
+    archive_path: Path | None = None,
+    merge: bool = False,
+    selection: dict | None = None,
+    profile_path: Path | None = None,
+    profile_sort: str = "fetch_ms",
+    profile_top: int = 10,
+) -> int:
     """Generates LookML view files from a Dataform model.
 
     Args:
         path_to_json_file (str): Path to the JSON file from compiled Dataform project.
         target_dir (str): Target directory for Looker views.
         tags (set[str]): Filter to dataform models using this tag.
+        shard_index (int): Zero based index of the shard to generate.
+        shard_count (int): Total number of shards the models are split into.
+        dry_run (bool): Print the changes to the views as JSON instead of saving them.
+        bundle_by (str | None): Bundle the views in one file per "dataset" or per "tag".
+        archive_path (Path | None): Save the views into this zip or tar archive.
+        merge (bool): Merge the views into the existing files, keeping customizations.
+        selection (dict | None): Additional options for `LookML`.
+        profile_path (Path | None): Prefix of the profiling report and stacks files.
+        profile_sort (str): Measure used to sort the tables of the profiling report.
+        profile_top (int): Number of most costly tables to log when profiling.
 
     Returns:
         int: 0 if the view generation was successful, 1 otherwise.
     """
     logging.info(f" Generating views from: {path_to_json_file}")
+    profiler = Profiler() if profile_path is not None else None
     try:
-        lookml_object = LookML(path_to_json_file, target_dir, tags=tags)
-        lookml_object.save_lookml_views()
+        lookml_object = LookML(
+            path_to_json_file,
+            target_dir,
+            tags=tags,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            bundle_by=bundle_by,
+            profiler=profiler,
+            read_only=dry_run,
+            **(selection or {}),
+        )
+        if dry_run:
+            json.dump(lookml_object.diff_lookml_views(), sys.stdout, indent=4)
+            sys.stdout.write("\n")
+        elif merge:
+            lookml_object.merge_lookml_views()
+        elif archive_path is not None:
+            lookml_object.save_lookml_archive(str(archive_path))
+        else:
+            lookml_object.save_lookml_views()
+        if profiler is not None:
+            profiler.stop()
+            profiler.log_top(profile_sort, profile_top)
+            profiler.write_report(f"{profile_path}.csv", profile_sort)
+            profiler.write_stacks(f"{profile_path}.folded")
         return 0
     except subprocess.CalledProcessError as e:
         logging.error(f"I failed...: {e}")
         return 1
 
 
+def _merge_manifests(manifest_paths: list[Path], target_dir: Path) -> int:
+    """Merges the manifests of all the shards into a single manifest.
+
+    Args:
+        manifest_paths (list[Path]): Paths to the manifests written by each shard.
+        target_dir (Path): Target directory for the merged manifest.
+
+    Returns:
+        int: 0 if the shards cover all the selected models, 1 otherwise.
+    """
+    try:
+        manifest = merge_shard_manifests([str(path) for path in manifest_paths])
+    except IncompleteShardsError as e:
+        logging.error(e)
+        return 1
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logging.error(f"Shard manifests could not be read: {e!r}")
+        return 1
+    manifest_path = target_dir / f"{MANIFEST_PREFIX}.json"
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    logging.info(f" Merged manifest saved to: {manifest_path}")
+    return 0
+
+
+def _serve(
+    path_to_json_file: str,
+    target_dir: str,
+    tags: set[str],
+    port: int,
+    shard_index: int = 0,
+    shard_count: int = 1,
+    bundle_by: str | None = None,
+    selection: dict | None = None,
+) -> int:
+    """Generates LookML view files and keeps serving regeneration requests.
+
+    Args:
+        path_to_json_file (str): Path to the JSON file from compiled Dataform project.
+        target_dir (str): Target directory for Looker views.
+        tags (set[str]): Filter to dataform models using this tag.
+        port (int): Local port for the regeneration API.
+        shard_index (int): Zero based index of the shard to generate and serve.
+        shard_count (int): Total number of shards the models are split into.
+        bundle_by (str | None): Bundle the views in one file per "dataset" or per "tag".
+        selection (dict | None): Additional options for `LookML`.
+
+    Returns:
+        int: 0 once the server is stopped.
+    """
+    lookml_object = LookML(
+        path_to_json_file,
+        target_dir,
+        tags=tags,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        bundle_by=bundle_by,
+        **(selection or {}),
+    )
+    lookml_object.save_lookml_views()
+    server = GeneratorServer(lookml_object, port=port)
+    logging.info(f" Serving regeneration requests on port {server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info(" Stopping the server")
+    finally:
+        server.server_close()
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """Main function for the CLI script.
 
@@ -69,6 +194,146 @@ def main(argv: Sequence[str] | None = None) -> int:
         nargs="+",
         required=False,
     )
+    parser.add_argument(
+        "--required-tags",
+        help="Filter to dataform models having all of these tags",
+        default=[],
+        type=str,
+        nargs="+",
+        required=False,
+    )
+    parser.add_argument(
+        "--excluded-tags",
+        help="Exclude the dataform models having any of these tags",
+        default=[],
+        type=str,
+        nargs="+",
+        required=False,
+    )
+    parser.add_argument(
+        "--schemas",
+        help="Filter to dataform models in these schemas",
+        default=[],
+        type=str,
+        nargs="+",
+        required=False,
+    )
+    parser.add_argument(
+        "--excluded-schemas",
+        help="Exclude the dataform models in these schemas",
+        default=[],
+        type=str,
+        nargs="+",
+        required=False,
+    )
+    parser.add_argument(
+        "--index-cache",
+        action="store_true",
+        help="Save an index of the compiled JSON file next to it and reuse it "
+        "while the file does not change.",
+    )
+    parser.add_argument(
+        "--schema-cache",
+        help="Cache the table schemas in this file between runs. Only the schemas "
+        "of the tables modified since the previous run are fetched.",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--description-precedence",
+        help="Column description used when both Dataform and BigQuery set one. "
+        "Default is 'dataform'.",
+        choices=["dataform", "bigquery"],
+        default="dataform",
+    )
+    parser.add_argument(
+        "--render-cache-size",
+        help="Number of rendered views kept to be reused by tables with the same "
+        "columns, 0 disables the cache. Default is 1024.",
+        default=1024,
+        type=int,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Profile the generation and write a per table report to PROFILE.csv "
+        "and flamegraph folded stacks to PROFILE.folded.",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--profile-sort",
+        help="Measure used to sort the tables of the profiling report. "
+        "Default is 'fetch_ms'.",
+        choices=Profiler.COLUMNS[1:],
+        default="fetch_ms",
+    )
+    parser.add_argument(
+        "--profile-top",
+        help="Number of most costly tables to log when profiling. Default is 10.",
+        default=10,
+        type=int,
+    )
+    parser.add_argument(
+        "--shard-index",
+        help="Zero based index of the shard to generate. Default is 0.",
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "--shard-count",
+        help="Split the models into this many shards by a stable hash of their id. "
+        "Default is 1.",
+        default=1,
+        type=int,
+    )
+    parser.add_argument(
+        "--merge-manifests",
+        help="Merge the manifests written by each shard and check that together "
+        "they cover all the models.",
+        default=[],
+        type=Path,
+        nargs="+",
+        required=False,
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        "--diff",
+        action="store_true",
+        dest="dry_run",
+        help="Print the changes to the views as JSON, with unified diffs, "
+        "without writing any file.",
+    )
+    parser.add_argument(
+        "--bundle-by",
+        help="Bundle the views in one file per dataset or per tag.",
+        choices=["dataset", "tag"],
+        default=None,
+    )
+    parser.add_argument(
+        "--archive",
+        help="Save the views into a single .zip, .tar, .tar.gz or .tgz archive "
+        "instead of the target directory.",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="Update only the generated fields of existing view files, keeping "
+        "the fields and overrides added by hand.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep running and regenerate views on requests to a local HTTP API.",
+    )
+    parser.add_argument(
+        "--port",
+        help="Local port of the HTTP API in serve mode. Default is 8765.",
+        default=8765,
+        type=int,
+    )
 
     args = parser.parse_args(argv)
 
@@ -79,8 +344,57 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO)
 
-    if source_file.is_file():
+    if args.merge_manifests:
+        return _merge_manifests(args.merge_manifests, target_dir)
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    if args.bundle_by and args.shard_count > 1:
+        parser.error("--bundle-by can not be used with --shard-count")
+    if args.merge and (args.bundle_by or args.archive):
+        parser.error("--merge can not be used with --bundle-by or --archive")
+    if args.serve and (args.merge or args.archive or args.dry_run or args.profile):
+        parser.error(
+            "--serve can not be used with --merge, --archive, --dry-run or --profile"
+        )
+
+    selection = {
+        "required_tags": args.required_tags,
+        "excluded_tags": args.excluded_tags,
+        "schemas": args.schemas,
+        "excluded_schemas": args.excluded_schemas,
+        "index_cache": args.index_cache,
+        "schema_cache_path": str(args.schema_cache) if args.schema_cache else None,
+        "description_precedence": args.description_precedence,
+        "render_cache": RenderCache(args.render_cache_size),
+    }
+
+    if source_file is not None and source_file.is_file():
         logging.info(f" Processing file: {source_file}")
-        return _generate_view(str(source_file), str(target_dir), set(tags))
+        if args.serve:
+            return _serve(
+                str(source_file),
+                str(target_dir),
+                set(tags),
+                args.port,
+                shard_index=args.shard_index,
+                shard_count=args.shard_count,
+                bundle_by=args.bundle_by,
+                selection=selection,
+            )
+        return _generate_view(
+            str(source_file),
+            str(target_dir),
+            set(tags),
+            shard_index=args.shard_index,
+            shard_count=args.shard_count,
+            dry_run=args.dry_run,
+            bundle_by=args.bundle_by,
+            archive_path=args.archive,
+            merge=args.merge,
+            selection=selection,
+            profile_path=args.profile,
+            profile_sort=args.profile_sort,
+            profile_top=args.profile_top,
+        )
     logging.error("The provided path is not taking to a JSON file")
     sys.exit(1)
@@ -0,0 +1,65 @@
+"""Comparison of generated LookML views with the files already saved on disk."""  # noqa: E501
+
+import difflib
+import hashlib
+import os
+
+
+def get_content_hash(content: bytes) -> str:
+    """Computes the hash used to compare view files.
+
+    Args:
+        content: The content of the view file.
+
+    Returns:
+        str: The hexadecimal BLAKE2b digest of the content.
+    """  # noqa: E501
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def diff_view_file(file_path: str, file_name: str, template: str) -> dict:
+    """Compares a generated view with the view file saved on disk.
+
+    The file is only read, and the unified diff is only computed when the
+    size or the hash of the file differ from the generated view. Bytes of the
+    file that are not valid UTF-8 are shown as replacement characters.
+
+    Args:
+        file_path: The path of the view file on disk.
+        file_name: The name of the view file, used in the unified diff header.
+        template: The generated LookML view.
+
+    Returns:
+        dict: The change of the file, with its `file` name, its `status`
+            ("added", "modified" or "unchanged"), the `old_hash` and `new_hash`
+            of its content and, when it changed, its unified `diff`.
+    """  # noqa: E501
+    new_content = template.encode("utf-8")
+    change = {
+        "file": file_name,
+        "status": "unchanged",
+        "old_hash": None,
+        "new_hash": get_content_hash(new_content),
+    }
+    try:
+        old_size = os.stat(file_path).st_size
+    except FileNotFoundError:
+        old_content = b""
+        change["status"] = "added"
+    else:
+        with open(file_path, "rb") as f:
+            old_content = f.read()
+        change["old_hash"] = get_content_hash(old_content)
+        if old_size == len(new_content) and change["old_hash"] == change["new_hash"]:
+            return change
+        change["status"] = "modified"
+
+    change["diff"] = "".join(
+        difflib.unified_diff(
+            old_content.decode("utf-8", errors="replace").splitlines(keepends=True),
+            template.splitlines(keepends=True),
+            fromfile="/dev/null" if change["status"] == "added" else f"a/{file_name}",
+            tofile=f"b/{file_name}",
+        )
+    )
+    return change
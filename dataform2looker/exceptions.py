@@ -48,3 +48,133 @@ class TableNotFoundError(Exception):
             f"or if the table exists"
         )
         super().__init__(self.msg_template)
+
+
+class InvalidShardError(Exception):
+    """Exception raised when an invalid shard index or shard count is provided."""
+
+    def __init__(self, shard_index: int, shard_count: int) -> None:
+        """Initializes the `InvalidShardError` exception.
+
+        Args:
+            shard_index (int): The requested shard index.
+            shard_count (int): The requested number of shards.
+        """
+        self.msg_template = (
+            f"Invalid shard {shard_index} of {shard_count}, shard count must be "
+            f"positive and the shard index must be between 0 and shard count - 1"
+        )
+        super().__init__(self.msg_template)
+
+
+class IncompleteShardsError(Exception):
+    """Exception raised when merged shard manifests do not cover the full selection."""  # noqa: E501
+
+    def __init__(self, reason: str) -> None:
+        """Initializes the `IncompleteShardsError` exception.
+
+        Args:
+            reason (str): Why the shard manifests could not be merged.
+        """
+        self.msg_template = f"Shard manifests could not be merged: {reason}"
+        super().__init__(self.msg_template)
+
+
+class TableNotSelectedError(Exception):
+    """Exception raised when a table is not part of the tables selected for generation."""  # noqa: E501
+
+    def __init__(self, table: str) -> None:
+        """Initializes the `TableNotSelectedError` exception.
+
+        Args:
+            table (str): The ID or view name of the table.
+        """
+        self.msg_template = (
+            f"Table '{table}' is not part of the tables selected for generation"
+        )
+        super().__init__(self.msg_template)
+
+
+class UnsupportedBundleTypeError(Exception):
+    """Exception raised when views are bundled by an unsupported key."""
+
+    def __init__(self, bundle_by: str, allowed_types: list) -> None:
+        """Initializes the `UnsupportedBundleTypeError` exception.
+
+        Args:
+            bundle_by (str): The unsupported bundle key.
+            allowed_types (list): The list of allowed bundle keys.
+        """
+        self.msg_template = (
+            f"Invalid bundle type, use one of {allowed_types}, got {bundle_by}"
+        )
+        super().__init__(self.msg_template)
+
+
+class ShardedBundleError(Exception):
+    """Exception raised when bundled views are split into several shards."""
+
+    def __init__(self, bundle_by: str, shard_count: int) -> None:
+        """Initializes the `ShardedBundleError` exception.
+
+        Args:
+            bundle_by (str): The bundle key.
+            shard_count (int): The requested number of shards.
+        """
+        self.msg_template = (
+            f"Views bundled by {bundle_by} can not be split into {shard_count} "
+            f"shards, the shards would overwrite each other's bundle files"
+        )
+        super().__init__(self.msg_template)
+
+
+class UnsupportedArchiveFormatError(Exception):
+    """Exception raised when the format of an archive is not supported."""
+
+    def __init__(self, archive_path: str, allowed_extensions: list) -> None:
+        """Initializes the `UnsupportedArchiveFormatError` exception.
+
+        Args:
+            archive_path (str): The path of the archive.
+            allowed_extensions (list): The list of allowed archive extensions.
+        """
+        self.msg_template = (
+            f"Unsupported archive '{archive_path}', "
+            f"use one of the extensions {allowed_extensions}"
+        )
+        super().__init__(self.msg_template)
+
+
+class InvalidDescriptionPrecedenceError(Exception):
+    """Exception raised when an invalid description precedence is encountered."""
+
+    def __init__(self, precedence: str, allowed_precedences: list) -> None:
+        """Initializes the `InvalidDescriptionPrecedenceError` exception.
+
+        Args:
+            precedence (str): The unsupported description precedence.
+            allowed_precedences (list): The list of allowed description precedences.
+        """
+        self.msg_template = (
+            f"Invalid description precedence, use one of {allowed_precedences}, "
+            f"got {precedence}"
+        )
+        super().__init__(self.msg_template)
+
+
+class DuplicateViewNameError(Exception):
+    """Exception raised when several views with the same name would be saved in the same file."""  # noqa: E501
+
+    def __init__(self, file_name: str, table_ids: list) -> None:
+        """Initializes the `DuplicateViewNameError` exception.
+
+        Args:
+            file_name (str): The name of the view file.
+            table_ids (list): The IDs of the tables with the same view name.
+        """
+        self.msg_template = (
+            f"Tables {table_ids} would all be saved as the same view in "
+            f"'{file_name}', exclude all but one of them or bundle the views "
+            f"by dataset"
+        )
+        super().__init__(self.msg_template)
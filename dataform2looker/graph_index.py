@@ -0,0 +1,195 @@
+"""Index over the tables of a compiled Dataform graph for fast repeated filtering."""  # noqa: E501
+
+import json
+import logging
+import os
+
+
+class GraphIndex:
+    """Index of the tables of a compiled Dataform graph by tag, schema, database and name.
+
+    Selections are computed with set operations on the index, without scanning
+    the tables of the compiled graph again. The index can be saved next to the
+    source JSON file and loaded instead of parsing the compiled graph on later runs.
+
+    Attributes:
+        table_ids (list[str]): The table IDs in the order of the compiled graph.
+        targets (dict[str, dict]): The target ("database", "schema" and "name") of each table ID.
+        table_tags (dict[str, list[str]]): The tags of each table ID.
+        tables_by_tag (dict[str, set[str]]): The table IDs having each tag.
+        tables_by_schema (dict[str, set[str]]): The table IDs in each schema.
+        tables_by_database (dict[str, set[str]]): The table IDs in each database.
+        tables_by_name (dict[str, set[str]]): The table IDs with each table name.
+        column_descriptions (dict[str, dict[str, str]]): The Dataform description of each column
+            path (e.g., "record.field") of each table ID.
+    """  # noqa: E501
+
+    _INDEX_VERSION = 2
+    _INDEX_SUFFIX = ".df2looker-index.json"
+
+    def __init__(
+        self,
+        targets: dict[str, dict],
+        table_tags: dict[str, list],
+        column_descriptions: dict[str, dict[str, str]] = None,
+    ) -> None:
+        """Initializes the `GraphIndex` object.
+
+        Args:
+            targets: The target of each table ID, in the order of the compiled graph.
+            table_tags: The tags of each table ID.
+            column_descriptions: The Dataform description of each column path of each table ID.
+        """  # noqa: E501
+        self.table_ids = list(targets)
+        self.targets = targets
+        self.table_tags = table_tags
+        self.column_descriptions = column_descriptions or {}
+        self.tables_by_tag = {}
+        self.tables_by_schema = {}
+        self.tables_by_database = {}
+        self.tables_by_name = {}
+        for table_id, target in targets.items():
+            for tag in table_tags.get(table_id, []):
+                self.tables_by_tag.setdefault(tag, set()).add(table_id)
+            self.tables_by_schema.setdefault(target["schema"], set()).add(table_id)
+            self.tables_by_database.setdefault(target["database"], set()).add(table_id)
+            self.tables_by_name.setdefault(target["name"], set()).add(table_id)
+        self.__positions = {table_id: i for i, table_id in enumerate(self.table_ids)}
+
+    @classmethod
+    def from_compiled_graph(cls, data: dict) -> "GraphIndex":
+        """Builds the index from a compiled Dataform graph in a single pass.
+
+        Args:
+            data: The content of the compiled Dataform JSON file.
+
+        Returns:
+            GraphIndex: The index of the tables of the graph.
+        """  # noqa: E501
+        targets = {}
+        table_tags = {}
+        column_descriptions = {}
+        for table in data["tables"]:
+            target = table["target"]
+            table_id = f"{target['database']}.{target['schema']}.{target['name']}"
+            targets[table_id] = {
+                "database": target["database"],
+                "schema": target["schema"],
+                "name": target["name"],
+            }
+            table_tags[table_id] = list(table.get("tags", []))
+            descriptions = {
+                ".".join(column["path"]): column["description"]
+                for column in table.get("actionDescriptor", {}).get("columns", [])
+                if column.get("description")
+            }
+            if descriptions:
+                column_descriptions[table_id] = descriptions
+        return cls(targets, table_tags, column_descriptions)
+
+    @classmethod
+    def load(
+        cls, source_json_path: str, use_cache: bool = False, read_only: bool = False
+    ) -> "GraphIndex":
+        """Loads the index of a compiled Dataform JSON file.
+
+        When `use_cache` is set, the index saved next to the source JSON file is
+        used if it was built from the same version of the file, otherwise the
+        index is built from the file and saved for the next runs.
+
+        Args:
+            source_json_path: The path to the compiled Dataform JSON file.
+            use_cache: Read and write the index saved next to the source JSON file.
+            read_only: Only read the saved index, never write it.
+
+        Returns:
+            GraphIndex: The index of the tables of the graph.
+        """  # noqa: E501
+        index_path = f"{source_json_path}{cls._INDEX_SUFFIX}"
+        source_stat = os.stat(source_json_path)
+        source_version = [source_stat.st_size, source_stat.st_mtime_ns]
+        if use_cache:
+            try:
+                with open(index_path) as file:
+                    cached = json.load(file)
+                if (
+                    cached["version"] == cls._INDEX_VERSION
+                    and cached["source"] == source_version
+                ):
+                    logging.debug(f"Loaded graph index {index_path}")
+                    return cls(
+                        cached["targets"],
+                        cached["table_tags"],
+                        cached["column_descriptions"],
+                    )
+            except (OSError, ValueError, KeyError) as e:
+                logging.debug(f"Could not load graph index {index_path}: {e}")
+
+        with open(source_json_path) as file:
+            index = cls.from_compiled_graph(json.load(file))
+        logging.debug(
+            f"Read file {source_json_path}, found {len(index.table_ids)} tables"
+        )
+        if use_cache and not read_only:
+            try:
+                with open(index_path, "w") as file:
+                    json.dump(
+                        {
+                            "version": cls._INDEX_VERSION,
+                            "source": source_version,
+                            "targets": index.targets,
+                            "table_tags": index.table_tags,
+                            "column_descriptions": index.column_descriptions,
+                        },
+                        file,
+                    )
+                logging.debug(f"Saved graph index {index_path}")
+            except OSError as e:
+                logging.warning(f"Could not save graph index {index_path}: {e}")
+        return index
+
+    def select(
+        self,
+        tags: set[str] = None,
+        required_tags: set[str] = None,
+        excluded_tags: set[str] = None,
+        schemas: set[str] = None,
+        excluded_schemas: set[str] = None,
+    ) -> list[str]:
+        """Selects table IDs with set operations on the index.
+
+        Args:
+            tags: Keep the tables having any of these tags (optional).
+            required_tags: Keep the tables having all of these tags (optional).
+            excluded_tags: Remove the tables having any of these tags (optional).
+            schemas: Keep the tables in any of these schemas (optional).
+            excluded_schemas: Remove the tables in any of these schemas (optional).
+
+        Returns:
+            list[str]: The selected table IDs, in the order of the compiled graph.
+        """  # noqa: E501
+        selected = set(self.table_ids)
+        if tags:
+            selected &= self.__union(self.tables_by_tag, tags)
+        for tag in required_tags or []:
+            selected &= self.tables_by_tag.get(tag, set())
+        if schemas:
+            selected &= self.__union(self.tables_by_schema, schemas)
+        if excluded_tags:
+            selected -= self.__union(self.tables_by_tag, excluded_tags)
+        if excluded_schemas:
+            selected -= self.__union(self.tables_by_schema, excluded_schemas)
+        return sorted(selected, key=self.__positions.__getitem__)
+
+    @staticmethod
+    def __union(tables_by_key: dict[str, set[str]], keys: set[str]) -> set[str]:
+        """Returns the union of the table IDs of several keys of an index.
+
+        Args:
+            tables_by_key: The index mapping keys to table IDs.
+            keys: The keys to combine.
+
+        Returns:
+            set[str]: The table IDs of any of the keys.
+        """  # noqa: E501
+        return set().union(*(tables_by_key.get(key, set()) for key in keys))
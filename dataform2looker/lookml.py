@@ -1,11 +1,30 @@
 """This module provides functionality for generating LookML view files based on a JSON source containing table information."""  # noqa: E501
 
-import json
+import contextlib
 import logging
+import os
 
-import lkml
-
+from dataform2looker.archive import write_archive
 from dataform2looker.database_mappers import GenericTable
+from dataform2looker.diff import diff_view_file
+from dataform2looker.exceptions import (
+    DuplicateViewNameError,
+    InvalidDescriptionPrecedenceError,
+    ShardedBundleError,
+    TableNotSelectedError,
+    UnsupportedBundleTypeError,
+)
+from dataform2looker.graph_index import GraphIndex
+from dataform2looker.merge import merge_view_files, save_merged_view_file
+from dataform2looker.profiling import Profiler
+from dataform2looker.render_cache import RenderCache
+from dataform2looker.schema_cache import SchemaCache
+from dataform2looker.sharding import (
+    filter_table_ids,
+    get_manifest_path,
+    validate_shard,
+    write_shard_manifest,
+)
 
 
 class LookML:
@@ -14,17 +33,42 @@ class LookML:
     Attributes:
         source_json_path (str): The path to the source JSON file containing table information.
         target_folder_path (str): The target folder where LookML view files will be saved.
-        lookml_templates (dict): A dictionary mapping table names to their LookML view templates.
+        lookml_templates (dict): A dictionary mapping table IDs to their LookML view templates.
         db_type (str): The type of the database ("bigquery" currently supported).
-        tags (set[str]): A set of tags to filter tables (not yet implemented).
+        tags (set[str]): A set of tags to filter tables, a table having any of the tags is selected.
+        required_tags (set[str]): A set of tags a table must all have to be selected.
+        excluded_tags (set[str]): A set of tags excluding the tables having any of them.
+        schemas (set[str]): A set of schemas to filter tables.
+        excluded_schemas (set[str]): A set of schemas excluding their tables.
+        index (GraphIndex): The index of the tables of the compiled Dataform graph.
+        description_precedence (str): The column description used when both Dataform and the database set one.
+        shard_index (int): The zero based index of the shard generated by this object.
+        shard_count (int): The total number of shards the selected tables are split into.
+        bundle_by (str): Bundle the views in one file per "dataset" or per "tag", or one file per view if None.
+        read_only (bool): Only read the index and schema caches, never write them.
     """  # noqa: E501
 
+    _BUNDLE_TYPES = ["dataset", "tag"]
+
     def __init__(
         self,
         source_json_path: str,
         target_folder_path: str,
         db_type: str = "bigquery",
         tags: list[str] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        bundle_by: str = None,
+        required_tags: list[str] = None,
+        excluded_tags: list[str] = None,
+        schemas: list[str] = None,
+        excluded_schemas: list[str] = None,
+        index_cache: bool = False,
+        schema_cache_path: str = None,
+        description_precedence: str = "dataform",
+        profiler: Profiler = None,
+        render_cache: RenderCache = None,
+        read_only: bool = False,
     ) -> None:
         """Initializes the `LookML` object.
 
@@ -32,27 +76,318 @@ class LookML:
             source_json_path: The path to the source JSON file.
             target_folder_path: The target folder for LookML view files.
             db_type: The type of the database ("bigquery" currently supported).
-            tags: A list of tags to filter tables (not yet implemented).
+            tags: A list of tags to filter tables, a table having any of the tags is selected.
+            shard_index: The zero based index of the shard to generate.
+            shard_count: The total number of shards, 1 generates all the selected tables.
+            bundle_by: Bundle the views in one file per "dataset" or per "tag" (optional).
+            required_tags: A list of tags a table must all have to be selected (optional).
+            excluded_tags: A list of tags excluding the tables having any of them (optional).
+            schemas: A list of schemas to filter tables (optional).
+            excluded_schemas: A list of schemas excluding their tables (optional).
+            index_cache: Save the index of the compiled graph next to the source JSON file
+                and reuse it on later runs.
+            schema_cache_path: The path of a file caching the table schemas between runs,
+                only the schemas of the tables that changed are fetched (optional).
+            description_precedence: The column description used when both Dataform and
+                the database set one, "dataform" or "bigquery".
+            profiler: A profiler recording the cost of each table (optional).
+            render_cache: A cache of rendered views to share, a new one is used if not provided.
+            read_only: Only read the index and schema caches, never write them, e.g. for a dry run.
+
+        Raises:
+            UnsupportedBundleTypeError: If an unsupported `bundle_by` is provided.
+            ShardedBundleError: If `bundle_by` is used with several shards.
+            InvalidDescriptionPrecedenceError: If an unsupported `description_precedence` is provided.
         """  # noqa: E501
+        validate_shard(shard_index, shard_count)
+        if bundle_by is not None and bundle_by not in self._BUNDLE_TYPES:
+            raise UnsupportedBundleTypeError(bundle_by, self._BUNDLE_TYPES)
+        if bundle_by is not None and shard_count > 1:
+            raise ShardedBundleError(bundle_by, shard_count)
+        if description_precedence not in GenericTable.DESCRIPTION_PRECEDENCES:
+            raise InvalidDescriptionPrecedenceError(
+                description_precedence, GenericTable.DESCRIPTION_PRECEDENCES
+            )
         self.source_json_path = source_json_path
         self.db_type = db_type
         self.tags = set(tags or [])
-        self.__tables_ids = self.__get_list_of_table_ids()
+        self.required_tags = set(required_tags or [])
+        self.excluded_tags = set(excluded_tags or [])
+        self.schemas = set(schemas or [])
+        self.excluded_schemas = set(excluded_schemas or [])
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.bundle_by = bundle_by
+        self.description_precedence = description_precedence
+        self.__profiler = profiler
+        self.__render_cache = (
+            render_cache if render_cache is not None else RenderCache()
+        )
+        self.read_only = read_only
+        self.index = GraphIndex.load(
+            source_json_path, use_cache=index_cache, read_only=read_only
+        )
+        self.__selected_tables_ids = self.__get_list_of_table_ids()
+        self.__tables_ids = filter_table_ids(
+            self.__selected_tables_ids, shard_index, shard_count
+        )
+        self.__check_view_names(self.__selected_tables_ids)
+        self.__client = None
+        self.__schema_cache = (
+            SchemaCache(schema_cache_path) if schema_cache_path else None
+        )
         self.__tables_list = self.__initialize_tables(self.__tables_ids)
         self.lookml_templates = self.__generate_lookml_templates(self.__tables_list)
         self.target_folder_path = target_folder_path
 
     def save_lookml_views(self) -> None:
-        """Generates and saves LookML view files for each table."""  # noqa: E501
-        for table_name, table_template in self.lookml_templates.items():
-            file_path = f"{self.target_folder_path}/{table_name}.view.lkml"
-            logging.debug(f"Creating file {file_path}")
-            with open(file_path, "w") as f:
-                f.write(table_template)
+        """Generates and saves LookML view files for each table, or each bundle of tables."""  # noqa: E501
+        view_files = self.get_view_files()
+        for file_name, content in view_files.items():
+            self.__save_lookml_view(file_name, content)
         logging.info(
-            f"A total of {len(self.lookml_templates)} LookML view files successfully \
+            f"A total of {len(view_files)} LookML view files successfully \
                 created in folder '{self.target_folder_path}'"
         )
+        if self.shard_count > 1:
+            self.save_shard_manifest()
+
+    def merge_lookml_views(self, max_workers: int | None = None) -> dict[str, int]:
+        """Merges the LookML views into the existing view files, keeping hand-written customizations.
+
+        Fields and keys added by hand to the view files are kept, and only the
+        generated fields are updated. View files whose generated part did not
+        change since the last merge, and view files that can not be parsed, are
+        left untouched. Bundled views are not supported.
+
+        Args:
+            max_workers: The number of processes parsing the view files, all the CPUs if None.
+
+        Returns:
+            dict[str, int]: The number of "merged", "unchanged" and "failed" view files.
+        """  # noqa: E501
+        view_files = {
+            f"{self.target_folder_path}/{self.__get_view_file_name(table.table_id)}": (
+                table.table_dictionary
+            )
+            for table in self.__tables_list
+        }
+        merged_files = merge_view_files(view_files, max_workers)
+        for file_path, content in merged_files.items():
+            if content is not None:
+                logging.debug(f"Merging file {file_path}")
+                save_merged_view_file(file_path, content, view_files[file_path])
+        unchanged = sum(content is None for content in merged_files.values())
+        merged = len(merged_files) - unchanged
+        failed = len(view_files) - len(merged_files)
+        logging.info(
+            f"A total of {merged} LookML view files successfully merged \
+                in folder '{self.target_folder_path}', {unchanged} unchanged, \
+                {failed} failed"
+        )
+        if self.shard_count > 1:
+            self.save_shard_manifest()
+        return {"merged": merged, "unchanged": unchanged, "failed": failed}
+
+    def save_lookml_archive(self, archive_path: str) -> None:
+        """Saves the LookML view files into a single zip or tar archive.
+
+        When sharded, the manifest of the shard is saved next to the archive.
+
+        Args:
+            archive_path: The path of the archive, ending in ".zip", ".tar", ".tar.gz" or ".tgz".
+        """  # noqa: E501
+        view_files = self.get_view_files()
+        write_archive(archive_path, view_files)
+        logging.info(
+            f"A total of {len(view_files)} LookML view files successfully \
+                saved in archive '{archive_path}'"
+        )
+        if self.shard_count > 1:
+            self.save_shard_manifest(os.path.dirname(os.path.abspath(archive_path)))
+
+    def get_view_files(self) -> dict[str, str]:
+        """Groups the LookML view templates into view files.
+
+        Returns:
+            dict[str, str]: A dictionary mapping the view file names to their content,
+                with one view per file, or several views per file when bundled.
+        """  # noqa: E501
+        bundles = {}
+        for table in self.__tables_list:
+            bundles.setdefault(self.__get_view_file_name(table.table_id), []).append(
+                self.lookml_templates[table.table_id]
+            )
+        return {
+            file_name: "\n\n".join(templates)
+            for file_name, templates in bundles.items()
+        }
+
+    def diff_lookml_views(self) -> dict:
+        """Compares the generated LookML views with the view files in the target folder.
+
+        Nothing is written to disk, the existing view files are only read.
+
+        Returns:
+            dict: A `summary` with the number of "added", "modified" and "unchanged"
+                view files, and the list of `files` with the change of each view file.
+        """  # noqa: E501
+        changes = [
+            diff_view_file(f"{self.target_folder_path}/{file_name}", file_name, content)
+            for file_name, content in self.get_view_files().items()
+        ]
+        summary = {"added": 0, "modified": 0, "unchanged": 0}
+        for change in changes:
+            summary[change["status"]] += 1
+        logging.info(
+            f"{summary['added']} LookML view files would be added and "
+            f"{summary['modified']} modified in folder '{self.target_folder_path}'"
+        )
+        return {"summary": summary, "files": changes}
+
+    def resolve_table_ids(self, tables: list[str]) -> list[str]:
+        """Resolves table IDs or view names to the IDs of the selected tables.
+
+        Args:
+            tables: A list of full table IDs or view names.
+
+        Returns:
+            list[str]: The full IDs of the tables, without duplicates.
+
+        Raises:
+            TableNotSelectedError: If a table is not part of the selected tables.
+        """  # noqa: E501
+        table_ids_by_name = {
+            table_id.split(".")[-1]: table_id for table_id in self.__tables_ids
+        }
+        table_ids = {}
+        for table in tables:
+            if table in self.__tables_ids:
+                table_ids[table] = None
+            elif table in table_ids_by_name:
+                table_ids[table_ids_by_name[table]] = None
+            else:
+                raise TableNotSelectedError(table)
+        return list(table_ids)
+
+    def regenerate(self, tables: list[str]) -> dict[str, str]:
+        """Fetches the schema of some tables again and saves their LookML views.
+
+        The other tables keep their previously generated views, and the
+        database client is reused.
+
+        Args:
+            tables: A list of full table IDs or view names.
+
+        Returns:
+            dict[str, str]: A dictionary mapping the regenerated table IDs to their view file.
+        """  # noqa: E501
+        table_ids = self.resolve_table_ids(tables)
+        regenerated_tables = {
+            table.table_id: table for table in self.__initialize_tables(table_ids)
+        }
+        self.__tables_list = [
+            regenerated_tables.get(table.table_id, table)
+            for table in self.__tables_list
+        ]
+        self.lookml_templates.update(
+            self.__generate_lookml_templates(list(regenerated_tables.values()))
+        )
+        file_names = {
+            table_id: self.__get_view_file_name(table_id) for table_id in table_ids
+        }
+        all_view_files = self.get_view_files()
+        file_paths = {
+            file_name: self.__save_lookml_view(file_name, all_view_files[file_name])
+            for file_name in set(file_names.values())
+        }
+        logging.info(f"Regenerated {len(file_paths)} LookML view files")
+        return {
+            table_id: file_paths[file_name]
+            for table_id, file_name in file_names.items()
+        }
+
+    def __save_lookml_view(self, file_name: str, content: str) -> str:
+        """Saves a LookML view file.
+
+        Args:
+            file_name: The name of the view file.
+            content: The LookML views of the file.
+
+        Returns:
+            str: The path of the view file.
+        """  # noqa: E501
+        file_path = f"{self.target_folder_path}/{file_name}"
+        logging.debug(f"Creating file {file_path}")
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def __get_view_file_name(self, table_id: str) -> str:
+        """Returns the name of the view file containing the view of a table.
+
+        When bundled by tag, a table with several tags goes to the bundle of its
+        first tag matching the tag filter, or of its first tag if no filter is used.
+
+        Args:
+            table_id: The full ID of the table.
+
+        Returns:
+            str: The name of the view file.
+        """  # noqa: E501
+        if self.bundle_by == "dataset":
+            bundle_name = table_id.split(".")[-2]
+        elif self.bundle_by == "tag":
+            tags = [
+                tag
+                for tag in self.index.table_tags.get(table_id, [])
+                if not self.tags or tag in self.tags
+            ]
+            bundle_name = tags[0] if tags else "untagged"
+        else:
+            bundle_name = table_id.split(".")[-1]
+        return f"{bundle_name}.view.lkml"
+
+    def __check_view_names(self, table_ids: list[str]) -> None:
+        """Checks that the views of the tables saved in the same file have different names.
+
+        The tables of all the shards are checked, so every shard fails the same way.
+
+        Args:
+            table_ids: The full IDs of the selected tables.
+
+        Raises:
+            DuplicateViewNameError: If several tables would be saved as the same view of a file.
+        """  # noqa: E501
+        table_ids_by_view = {}
+        for table_id in table_ids:
+            view = (self.__get_view_file_name(table_id), table_id.split(".")[-1])
+            table_ids_by_view.setdefault(view, []).append(table_id)
+        for (file_name, _), view_table_ids in table_ids_by_view.items():
+            if len(view_table_ids) > 1:
+                raise DuplicateViewNameError(file_name, view_table_ids)
+
+    def save_shard_manifest(self, folder_path: str = None) -> None:
+        """Saves the manifest listing the views generated by this shard.
+
+        Args:
+            folder_path: The folder of the manifest, the target folder if None.
+        """  # noqa: E501
+        view_files = {
+            table.table_id: self.__get_view_file_name(table.table_id)
+            for table in self.__tables_list
+        }
+        write_shard_manifest(
+            get_manifest_path(
+                folder_path or self.target_folder_path,
+                self.shard_index,
+                self.shard_count,
+            ),
+            self.shard_index,
+            self.shard_count,
+            self.__selected_tables_ids,
+            view_files,
+        )
 
     def __generate_lookml_templates(self, tables_list: list[GenericTable]) -> dict:
         """Generates LookML view templates for a list of `GenericTable` objects.
@@ -61,17 +396,43 @@ class LookML:
             tables_list: A list of `GenericTable` objects representing the tables.
 
         Returns:
-            A dictionary mapping table names to their LookML view templates.
+            A dictionary mapping table IDs to their LookML view templates.
         """  # noqa: E501
         lookml_tables = {}
         for table in tables_list:
-            lookml_tables[table.table_name] = lkml.dump(table.table_dictionary)
+            with self.__measure(table.table_id, "render"):
+                lookml_tables[table.table_id] = self.__render_cache.render(
+                    table.table_dictionary
+                )
+            if self.__profiler is not None:
+                self.__profiler.record(
+                    table.table_id,
+                    output_bytes=len(lookml_tables[table.table_id].encode("utf-8")),
+                )
             # TODO check if we should use lkml dump to create the file
             # If we want to control the saving of the file might be easier
             # to do it outside the lib
             # https://lkml.readthedocs.io/en/latest/lkml.html#module-lkml
+        logging.debug(
+            f"Render cache: {self.__render_cache.hits} hits, "
+            f"{self.__render_cache.misses} misses"
+        )
         return lookml_tables
 
+    def __measure(self, table_id: str, stage: str) -> contextlib.AbstractContextManager:
+        """Measures a stage of a table with the profiler, if profiling is enabled.
+
+        Args:
+            table_id: The full ID of the table.
+            stage: The name of the stage, "fetch" or "render".
+
+        Returns:
+            contextlib.AbstractContextManager: The context manager measuring the stage.
+        """  # noqa: E501
+        if self.__profiler is None:
+            return contextlib.nullcontext()
+        return self.__profiler.measure(table_id, stage)
+
     def __initialize_tables(
         self,
         tables_ids: list[str],
@@ -84,29 +445,46 @@ class LookML:
         Returns:
             A list of `GenericTable` objects representing the tables.
         """  # noqa: E501
-        tables_list = [GenericTable(table_id, self.db_type) for table_id in tables_ids]
+        if tables_ids and self.__client is None:
+            self.__client = GenericTable.create_client(self.db_type)
+        if tables_ids and self.__schema_cache is not None:
+            self.__schema_cache.refresh(
+                tables_ids,
+                GenericTable.create_freshness_probe(self.db_type, self.__client),
+            )
+        tables_list = []
+        for table_id in tables_ids:
+            with self.__measure(table_id, "fetch"):
+                table = GenericTable(
+                    table_id, self.db_type, self.__client, self.__schema_cache
+                )
+            tables_list.append(table)
+            if self.__profiler is not None:
+                self.__profiler.record(
+                    table_id,
+                    columns=len(table.dimensions) + len(table.dimension_group),
+                )
+        for table in tables_list:
+            table.apply_descriptions(
+                self.index.column_descriptions.get(table.table_id, {}),
+                self.description_precedence,
+            )
+        if tables_ids and self.__schema_cache is not None and not self.read_only:
+            self.__schema_cache.save()
         return tables_list
 
     def __get_list_of_table_ids(self) -> list[str]:
-        """Extracts table IDs from the source JSON file.
+        """Selects the table IDs from the index of the source JSON file.
 
         Returns:
             A list of table IDs in the format "project.dataset.table".
         """  # noqa: E501
-        with open(self.source_json_path) as file:
-            data = json.load(file)
-            tables = data["tables"]
-        if self.tags:
-            table_id_list = [
-                f"{table['target']['database']}.{table['target']['schema']}.{table['target']['name']}"
-                for table in tables
-                if self.tags.intersection(set(table["tags"]))
-            ]
-        else:
-            table_id_list = [
-                f"{table['target']['database']}.{table['target']['schema']}.{table['target']['name']}"
-                for table in tables
-            ]
+        table_id_list = self.index.select(
+            tags=self.tags,
+            required_tags=self.required_tags,
+            excluded_tags=self.excluded_tags,
+            schemas=self.schemas,
+            excluded_schemas=self.excluded_schemas,
+        )
         logging.debug(f"Table id list: {table_id_list}")
-        logging.debug(f"Read file {self.source_json_path}, found {len(tables)}")
         return table_id_list
@@ -0,0 +1,534 @@
+"""Merging of generated LookML views into view files customized by hand."""  # noqa: E501
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import lkml
+from lkml.tree import BlockNode, DocumentNode, ListNode, SyntaxNode
+
+GENERATED_HASH_MARKER = "# df2looker generated:"
+_FIELD_TYPES = ["dimensions", "dimension_groups", "measures"]
+_STATE_FOLDER = ".df2looker"
+
+
+def get_generated_hash(table_dictionary: dict) -> str:
+    """Computes the hash of the generated part of a view.
+
+    Args:
+        table_dictionary: The generated LookML dictionary of the view.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the canonical JSON of the dictionary.
+    """  # noqa: E501
+    content = json.dumps(table_dictionary, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_generated_field_names(table_dictionary: dict) -> list[str]:
+    """Lists the names of the generated fields of a view.
+
+    Args:
+        table_dictionary: The generated LookML dictionary of the view.
+
+    Returns:
+        list[str]: The names of the generated dimensions, dimension groups and measures.
+    """  # noqa: E501
+    view = table_dictionary["view"]
+    return [
+        field["name"]
+        for field_type in _FIELD_TYPES
+        for field in view.get(field_type, [])
+    ]
+
+
+def get_generated_header(table_dictionary: dict) -> str:
+    """Builds the first line of a merged view file.
+
+    Args:
+        table_dictionary: The generated LookML dictionary of the view.
+
+    Returns:
+        str: The marker followed by the hash of the generated view and the
+            comma separated names of its generated fields.
+    """  # noqa: E501
+    field_names = ",".join(get_generated_field_names(table_dictionary))
+    return (
+        f"{GENERATED_HASH_MARKER} {get_generated_hash(table_dictionary)} {field_names}"
+    )
+
+
+def parse_generated_header(first_line: str) -> tuple[str | None, set[str]]:
+    """Parses the first line of a merged view file.
+
+    Args:
+        first_line: The first line of the view file.
+
+    Returns:
+        tuple[str | None, set[str]]: The hash of the generated view and the names of
+            the generated fields, or None and an empty set if the line was not written by a merge.
+    """  # noqa: E501
+    if not first_line.startswith(GENERATED_HASH_MARKER):
+        return None, set()
+    generated_hash, _, field_names = (
+        first_line[len(GENERATED_HASH_MARKER) :].strip().partition(" ")
+    )
+    return generated_hash, set(filter(None, field_names.split(",")))
+
+
+def read_generated_hash(file_path: str) -> str | None:
+    """Reads the hash of the generated part of a view file from its first line.
+
+    Args:
+        file_path: The path of the view file.
+
+    Returns:
+        str | None: The hash written by the last merge, or None if the file does not
+            exist or was not written by a merge.
+    """  # noqa: E501
+    try:
+        with open(file_path) as f:
+            first_line = f.readline()
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    return parse_generated_header(first_line)[0]
+
+
+def get_state_path(file_path: str) -> str:
+    """Returns the path of the file recording the generated view of the last merge.
+
+    Args:
+        file_path: The path of the view file.
+
+    Returns:
+        str: The path of the JSON state file, in a `.df2looker` folder next to the view file.
+    """  # noqa: E501
+    folder, file_name = os.path.split(file_path)
+    return os.path.join(folder, _STATE_FOLDER, f"{file_name}.json")
+
+
+def read_previous_fields(
+    file_path: str, first_line: str, existing: dict
+) -> dict[str, dict]:
+    """Reads the fields generated by the previous merge of a view file.
+
+    The generated values are read from the state file of the view file, if it
+    matches the hash in the first line of the file. Otherwise only the names of
+    the generated fields are known from the first line. A file without that line
+    was written by a run without merge, so its dimensions and dimension groups
+    selecting the column of the same name are considered generated.
+
+    Args:
+        file_path: The path of the view file.
+        first_line: The first line of the view file.
+        existing: The LookML dictionary of the view file.
+
+    Returns:
+        dict[str, dict]: A dictionary mapping the names of the previously generated
+            fields to their generated keys and values, empty when the values are unknown.
+    """  # noqa: E501
+    generated_hash, field_names = parse_generated_header(first_line)
+    if generated_hash is None:
+        return {
+            field["name"]: {}
+            for view in existing.get("views", [])
+            for field_type in ["dimensions", "dimension_groups"]
+            for field in view.get(field_type, [])
+            if field.get("sql") == f"${{TABLE}}.{field.get('name')}"
+        }
+    try:
+        with open(get_state_path(file_path)) as f:
+            previous_dictionary = json.load(f)
+    except (FileNotFoundError, ValueError):
+        previous_dictionary = None
+    if (
+        previous_dictionary is None
+        or get_generated_hash(previous_dictionary) != generated_hash
+    ):
+        return dict.fromkeys(field_names, {})
+    view = previous_dictionary["view"]
+    return {
+        field["name"]: field
+        for field_type in _FIELD_TYPES
+        for field in view.get(field_type, [])
+    }
+
+
+def _is_empty(value: object) -> bool:
+    """Checks if a LookML value is empty.
+
+    Args:
+        value: The value of a key of a field.
+
+    Returns:
+        bool: True if the value is None, an empty string or an empty list.
+    """  # noqa: E501
+    return value is None or value == "" or value == []
+
+
+def _merge_field(
+    existing_field: dict, generated_field: dict, previous_field: dict
+) -> dict:
+    """Merges a generated field into the existing field with the same name.
+
+    A generated key replaces the existing value only if its generated value
+    changed since the previous merge, so values edited by hand are kept. When
+    the previous generated value is unknown, the generated value replaces the
+    existing one unless it is empty, e.g. an undocumented column never erases
+    a description written by hand.
+
+    Args:
+        existing_field: The field of the existing view.
+        generated_field: The generated field.
+        previous_field: The field generated by the previous merge, empty if unknown.
+
+    Returns:
+        dict: The merged field, keeping the keys added by hand (e.g. `label` or `hidden`).
+    """  # noqa: E501
+    merged_field = dict(existing_field)
+    for key, value in generated_field.items():
+        if key not in existing_field:
+            merged_field[key] = value
+        elif key in previous_field:
+            if value != previous_field[key]:
+                merged_field[key] = value
+        elif not _is_empty(value) or _is_empty(existing_field[key]):
+            merged_field[key] = value
+    return merged_field
+
+
+def _merge_fields(
+    existing_fields: list[dict],
+    generated_fields: list[dict],
+    previous_fields: dict[str, dict],
+) -> list:
+    """Merges generated fields into the fields of an existing view.
+
+    Generated fields are merged into the existing field with the same name.
+    Fields generated by the previous merge that are no longer generated, e.g.
+    of a removed column, are dropped, and the other existing fields are kept
+    as authored by hand.
+
+    Args:
+        existing_fields: The fields of the existing view.
+        generated_fields: The generated fields.
+        previous_fields: The fields generated by the previous merge, by name.
+
+    Returns:
+        list: The merged fields, in the order of the existing view followed by the new generated fields.
+    """  # noqa: E501
+    generated_by_name = {field["name"]: field for field in generated_fields}
+    merged_fields = []
+    for field in existing_fields:
+        name = field.get("name")
+        if name in generated_by_name:
+            merged_fields.append(
+                _merge_field(
+                    field, generated_by_name.pop(name), previous_fields.get(name, {})
+                )
+            )
+        elif name not in previous_fields:
+            merged_fields.append(field)
+        else:
+            logging.debug(f"Dropping field '{name}' no longer generated")
+    merged_fields.extend(generated_by_name.values())
+    return merged_fields
+
+
+def merge_view(
+    existing_view: dict,
+    generated_view: dict,
+    previous_fields: dict[str, dict] = None,
+) -> dict:
+    """Merges a generated view into an existing view customized by hand.
+
+    Args:
+        existing_view: The LookML dictionary of the existing view.
+        generated_view: The LookML dictionary of the generated view.
+        previous_fields: The fields generated by the previous merge by name, the only
+            existing fields that can be dropped, with their generated values if known (optional).
+
+    Returns:
+        dict: The LookML dictionary of the merged view.
+    """  # noqa: E501
+    merged_view = {
+        **existing_view,
+        "name": generated_view["name"],
+        "sql_table_name": generated_view["sql_table_name"],
+    }
+    for field_type in _FIELD_TYPES:
+        merged_fields = _merge_fields(
+            existing_view.get(field_type, []),
+            generated_view.get(field_type, []),
+            previous_fields or {},
+        )
+        if merged_fields:
+            merged_view[field_type] = merged_fields
+        else:
+            merged_view.pop(field_type, None)
+    return merged_view
+
+
+def _get_node_key(node: SyntaxNode) -> tuple[str, str | None]:
+    """Returns the key identifying a node among its siblings.
+
+    Args:
+        node: A block, pair or list node of a LookML parse tree.
+
+    Returns:
+        tuple[str, str | None]: The type of the node and the name of a named block.
+    """  # noqa: E501
+    name = node.name.value if isinstance(node, BlockNode) and node.name else None
+    return node.type.value, name
+
+
+def _get_trailing_trivia(node: SyntaxNode) -> str:
+    """Returns the whitespace and comments following a node.
+
+    Args:
+        node: A block, pair or list node of a LookML parse tree.
+
+    Returns:
+        str: The suffix of the last token of the node.
+    """  # noqa: E501
+    if isinstance(node, BlockNode):
+        return node.right_brace.suffix
+    if isinstance(node, ListNode):
+        return node.right_bracket.suffix
+    return node.value.suffix
+
+
+def _set_trailing_trivia(node: SyntaxNode, trivia: str) -> SyntaxNode:
+    """Replaces the whitespace and comments following a node.
+
+    Args:
+        node: A block, pair or list node of a LookML parse tree.
+        trivia: The new suffix of the last token of the node.
+
+    Returns:
+        SyntaxNode: A copy of the node with the new trivia.
+    """  # noqa: E501
+    if isinstance(node, BlockNode):
+        return replace(node, right_brace=replace(node.right_brace, suffix=trivia))
+    if isinstance(node, ListNode):
+        return replace(node, right_bracket=replace(node.right_bracket, suffix=trivia))
+    return replace(node, value=replace(node.value, suffix=trivia))
+
+
+def _graft_items(
+    old_items: tuple, old_leading: str, new_items: tuple, new_leading: str
+) -> tuple[str, tuple]:
+    """Moves the comments of existing nodes onto the nodes of a merged container.
+
+    In a parse tree, the comments preceding a node are stored either before its
+    type or after the previous token, i.e. the opening brace or the previous
+    sibling. Each merged node matching an existing node gets the comments that
+    preceded it, and the blocks are grafted recursively to keep their inner comments.
+
+    Args:
+        old_items: The nodes of the existing container.
+        old_leading: The trivia preceding the first existing node.
+        new_items: The nodes of the merged container.
+        new_leading: The trivia preceding the first merged node.
+
+    Returns:
+        tuple[str, tuple]: The trivia preceding the first node and the grafted nodes.
+    """  # noqa: E501
+    if not new_items:
+        return old_leading, new_items
+    old_leadings = [old_leading, *map(_get_trailing_trivia, old_items)]
+    new_leadings = [new_leading, *map(_get_trailing_trivia, new_items)]
+    old_by_key = {
+        _get_node_key(item): (item, old_leadings[i]) for i, item in enumerate(old_items)
+    }
+    leadings = []
+    items = []
+    for i, new_item in enumerate(new_items):
+        old_item, leading = old_by_key.get(
+            _get_node_key(new_item), (None, new_leadings[i])
+        )
+        if old_item is not None:
+            new_item = replace(
+                new_item, type=replace(new_item.type, prefix=old_item.type.prefix)
+            )
+        if isinstance(old_item, BlockNode) and isinstance(new_item, BlockNode):
+            new_item = _graft_block(old_item, new_item)
+        leadings.append(leading)
+        items.append(new_item)
+    trailing = old_leadings[-1] if old_items else new_leadings[-1]
+    items = [
+        _set_trailing_trivia(item, trivia)
+        for item, trivia in zip(items, [*leadings[1:], trailing], strict=True)
+    ]
+    return leadings[0], tuple(items)
+
+
+def _graft_block(old_block: BlockNode, new_block: BlockNode) -> BlockNode:
+    """Keeps the comments of an existing block in its merged block.
+
+    Args:
+        old_block: The existing block.
+        new_block: The merged block.
+
+    Returns:
+        BlockNode: The merged block with the comments of the existing block.
+    """  # noqa: E501
+    leading, items = _graft_items(
+        old_block.container.items,
+        old_block.left_brace.suffix,
+        new_block.container.items,
+        new_block.left_brace.suffix,
+    )
+    return replace(
+        new_block,
+        left_brace=replace(new_block.left_brace, suffix=leading),
+        container=replace(new_block.container, items=items),
+    )
+
+
+def _dump_keeping_comments(content: str, merged: dict) -> str:
+    """Dumps a merged LookML dictionary, keeping the comments of the existing file.
+
+    Comments preceding a node that is kept, or inside a block that is kept, are
+    preserved. The comments of removed fields are dropped.
+
+    Args:
+        content: The content of the existing view file.
+        merged: The merged LookML dictionary of the file.
+
+    Returns:
+        str: The merged LookML, without the first line written by the previous merge.
+    """  # noqa: E501
+    old_document = lkml.parse(content)
+    new_document = lkml.parse(lkml.dump(merged))
+    prefix = old_document.prefix
+    if prefix.startswith(GENERATED_HASH_MARKER):
+        prefix = prefix.partition("\n")[2]
+    leading, items = _graft_items(
+        old_document.container.items,
+        prefix,
+        new_document.container.items,
+        new_document.prefix,
+    )
+    return str(
+        DocumentNode(
+            container=replace(new_document.container, items=items),
+            prefix=leading,
+            suffix=old_document.suffix,
+        )
+    )
+
+
+def merge_view_file(file_path: str, table_dictionary: dict) -> str:
+    """Merges a generated view into a view file.
+
+    The comments of the existing file are kept, except the comments of the
+    fields that are removed.
+
+    Args:
+        file_path: The path of the view file, which may not exist yet.
+        table_dictionary: The generated LookML dictionary of the view.
+
+    Returns:
+        str: The content of the merged view file, starting with the hash and the
+            field names of the generated view.
+    """  # noqa: E501
+    generated_view = table_dictionary["view"]
+    try:
+        with open(file_path) as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = ""
+    existing = lkml.load(content)
+    previous_fields = read_previous_fields(
+        file_path, content.partition("\n")[0], existing
+    )
+    views = existing.get("views", [])
+    for index, view in enumerate(views):
+        if view.get("name") == generated_view["name"]:
+            views[index] = merge_view(view, generated_view, previous_fields)
+            break
+    else:
+        views.append(generated_view)
+    existing["views"] = views
+    merged_content = _dump_keeping_comments(content, existing)
+    return f"{get_generated_header(table_dictionary)}\n{merged_content}"
+
+
+def save_merged_view_file(file_path: str, content: str, table_dictionary: dict) -> None:
+    """Saves a merged view file and records its generated view for the next merge.
+
+    Args:
+        file_path: The path of the view file.
+        content: The content of the merged view file.
+        table_dictionary: The generated LookML dictionary of the view.
+    """  # noqa: E501
+    with open(file_path, "w") as f:
+        f.write(content)
+    state_path = get_state_path(file_path)
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    with open(state_path, "w") as f:
+        json.dump(table_dictionary, f, sort_keys=True)
+
+
+def _merge_view_file(job: tuple[str, dict]) -> tuple[str | None, str | None]:
+    """Unpacks a merge job for `ProcessPoolExecutor.map`.
+
+    Errors are returned instead of raised, so a single invalid view file does
+    not abort the merge of the other files.
+
+    Args:
+        job: The path of the view file and the generated LookML dictionary.
+
+    Returns:
+        tuple[str | None, str | None]: The content of the merged view file, or None
+            and the error if the existing file could not be parsed.
+    """  # noqa: E501
+    try:
+        return merge_view_file(*job), None
+    except (SyntaxError, ValueError) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def merge_view_files(
+    view_files: dict[str, dict], max_workers: int | None = None
+) -> dict[str, str | None]:
+    """Merges generated views into their view files, parsing the files in parallel.
+
+    Files whose generated part did not change since the last merge are not parsed.
+    Files that can not be parsed are logged and left untouched.
+
+    Args:
+        view_files: A dictionary mapping the view file paths to their generated LookML dictionary.
+        max_workers: The number of processes parsing the files, all the CPUs if None.
+
+    Returns:
+        dict[str, str | None]: A dictionary mapping the view file paths to their merged
+            content, or None for the files that are already up to date. The files
+            that could not be parsed are not included.
+    """  # noqa: E501
+    merged_files = {}
+    jobs = []
+    for file_path, table_dictionary in view_files.items():
+        if read_generated_hash(file_path) == get_generated_hash(table_dictionary):
+            merged_files[file_path] = None
+        else:
+            jobs.append((file_path, table_dictionary))
+    logging.debug(f"Merging {len(jobs)} view files, {len(merged_files)} up to date")
+
+    if max_workers == 1 or len(jobs) <= 1:
+        merged_contents = map(_merge_view_file, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            merged_contents = list(executor.map(_merge_view_file, jobs, chunksize=32))
+    for (file_path, _), (content, error) in zip(jobs, merged_contents, strict=True):
+        if error is not None:
+            logging.warning(
+                f"Skipping view file {file_path}, it could not be parsed: {error}"
+            )
+            continue
+        merged_files[file_path] = content
+    return merged_files
@@ -0,0 +1,160 @@
+"""Per-table profiling of the time and memory spent generating LookML views."""  # noqa: E501
+
+import contextlib
+import csv
+import logging
+import time
+import tracemalloc
+from collections.abc import Generator
+
+
+class Profiler:
+    """Records the cost of each table while the LookML views are generated.
+
+    For each table, the profiler records the latency of the schema fetch
+    (`GenericTable` construction), the number of columns, the render time of
+    `lkml.dump`, the size of the rendered view and the peak of the memory
+    allocated by Python during those stages, measured with `tracemalloc`.
+
+    Attributes:
+        records (dict[str, dict]): The measures of each table ID.
+        stacks (dict[str, int]): The time in microseconds spent in each folded stack.
+    """  # noqa: E501
+
+    COLUMNS = [
+        "table_id",
+        "fetch_ms",
+        "columns",
+        "render_ms",
+        "output_bytes",
+        "peak_bytes",
+    ]
+
+    def __init__(self) -> None:
+        """Initializes the `Profiler` object and starts tracing memory allocations."""  # noqa: E501
+        self.records = {}
+        self.stacks = {}
+        self.__started_tracing = not tracemalloc.is_tracing()
+        if self.__started_tracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def measure(self, table_id: str, stage: str) -> Generator[None, None, None]:
+        """Measures the time and the memory allocation peak of a stage of a table.
+
+        Args:
+            table_id: The full ID of the table.
+            stage: The name of the stage, "fetch" or "render".
+
+        Yields:
+            None: Control to the measured code.
+        """  # noqa: E501
+        tracemalloc.reset_peak()
+        memory_before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _, memory_peak = tracemalloc.get_traced_memory()
+            record = self.record(table_id)
+            record[f"{stage}_ms"] = record.get(f"{stage}_ms", 0) + elapsed * 1000
+            record["peak_bytes"] = max(
+                record.get("peak_bytes", 0), memory_peak - memory_before
+            )
+            stack = f"df2looker;{stage};{table_id}"
+            self.stacks[stack] = self.stacks.get(stack, 0) + round(elapsed * 1e6)
+
+    def record(self, table_id: str, **measures: float) -> dict:
+        """Adds measures to the record of a table.
+
+        Args:
+            table_id: The full ID of the table.
+            **measures: The measures to set, such as `columns` or `output_bytes`.
+
+        Returns:
+            dict: The record of the table.
+        """  # noqa: E501
+        record = self.records.setdefault(table_id, {"table_id": table_id})
+        record.update(measures)
+        return record
+
+    def get_top(self, sort_by: str = "fetch_ms", top_n: int | None = None) -> list:
+        """Returns the most costly tables.
+
+        Args:
+            sort_by: The measure used to sort the tables, one of `COLUMNS`.
+            top_n: The number of tables to return, all the tables if None.
+
+        Returns:
+            list: The records of the tables, sorted by decreasing `sort_by`.
+        """  # noqa: E501
+        records = sorted(
+            self.records.values(),
+            key=lambda record: record.get(sort_by, 0),
+            reverse=True,
+        )
+        return records[:top_n]
+
+    def write_report(self, report_path: str, sort_by: str = "fetch_ms") -> None:
+        """Writes the records of all the tables to a CSV file.
+
+        Args:
+            report_path: The path of the CSV report.
+            sort_by: The measure used to sort the tables, one of `COLUMNS`.
+        """  # noqa: E501
+        with open(report_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.COLUMNS, restval=0)
+            writer.writeheader()
+            for record in self.get_top(sort_by):
+                writer.writerow(self.__round(record, 3))
+        logging.info(f"Profiling report saved to {report_path}")
+
+    def write_stacks(self, stacks_path: str) -> None:
+        """Writes the folded stacks, as expected by flamegraph tools.
+
+        Each line contains the semicolon separated stack and the time spent in it
+        in microseconds, e.g. "df2looker;fetch;project.dataset.table 1234".
+
+        Args:
+            stacks_path: The path of the folded stacks file.
+        """  # noqa: E501
+        with open(stacks_path, "w") as f:
+            for stack, microseconds in sorted(self.stacks.items()):
+                f.write(f"{stack} {microseconds}\n")
+        logging.info(f"Profiling stacks saved to {stacks_path}")
+
+    def log_top(self, sort_by: str = "fetch_ms", top_n: int = 10) -> None:
+        """Logs the most costly tables.
+
+        Args:
+            sort_by: The measure used to sort the tables, one of `COLUMNS`.
+            top_n: The number of tables to log.
+        """  # noqa: E501
+        logging.info(f"Top {top_n} tables by {sort_by}:")
+        for record in self.get_top(sort_by, top_n):
+            values = self.__round(record, 1)
+            logging.info(
+                " ".join(f"{column}={values.get(column, 0)}" for column in self.COLUMNS)
+            )
+
+    @staticmethod
+    def __round(record: dict, digits: int) -> dict:
+        """Rounds the time measures of a record.
+
+        Args:
+            record: The record of a table.
+            digits: The number of decimals to keep.
+
+        Returns:
+            dict: A copy of the record with rounded float measures.
+        """  # noqa: E501
+        return {
+            key: round(value, digits) if isinstance(value, float) else value
+            for key, value in record.items()
+        }
+
+    def stop(self) -> None:
+        """Stops tracing memory allocations if the profiler started it."""
+        if self.__started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
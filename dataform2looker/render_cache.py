@@ -0,0 +1,104 @@
+"""Content-addressed cache of rendered LookML views."""  # noqa: E501
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import lkml
+
+_NAME_PLACEHOLDER = "__df2looker_view_name__"
+_SQL_TABLE_NAME_PLACEHOLDER = "__df2looker_sql_table_name__"
+
+
+class RenderCache:
+    """Least recently used cache of LookML views rendered by `lkml.dump`.
+
+    Views are keyed by a canonical hash of their table dictionary without the
+    `name` and `sql_table_name`, so tables with the same schema in different
+    datasets (e.g. dev, staging and prod) share the same rendered body. The
+    body is rendered with placeholders, replaced by the values of each table
+    on every hit. The cache is safe to use from several threads.
+
+    Attributes:
+        max_size (int): The maximum number of rendered bodies kept, 0 disables the cache.
+        hits (int): The number of views rendered from the cache.
+        misses (int): The number of views rendered with `lkml.dump`.
+    """  # noqa: E501
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """Initializes the `RenderCache` object.
+
+        Args:
+            max_size: The maximum number of rendered bodies kept, 0 disables the cache.
+        """  # noqa: E501
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__bodies = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get_key(table_dictionary: dict) -> str:
+        """Computes the cache key of a table dictionary.
+
+        Args:
+            table_dictionary: The LookML dictionary of the view.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the canonical JSON of the view,
+                without its `name` and `sql_table_name`.
+        """  # noqa: E501
+        view = {
+            key: value
+            for key, value in table_dictionary["view"].items()
+            if key not in ("name", "sql_table_name")
+        }
+        content = json.dumps(view, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def render(self, table_dictionary: dict) -> str:
+        """Renders a view, reusing the body of a view with the same content.
+
+        Args:
+            table_dictionary: The LookML dictionary of the view.
+
+        Returns:
+            str: The rendered LookML view, identical to `lkml.dump(table_dictionary)`.
+        """  # noqa: E501
+        view = table_dictionary["view"]
+        if self.max_size <= 0:
+            with self.__lock:
+                self.misses += 1
+            return lkml.dump(table_dictionary)
+
+        key = self.get_key(table_dictionary)
+        with self.__lock:
+            body = self.__bodies.get(key)
+            if body is not None:
+                self.__bodies.move_to_end(key)
+                self.hits += 1
+        if body is None:
+            body = lkml.dump({
+                "view": {
+                    **view,
+                    "name": _NAME_PLACEHOLDER,
+                    "sql_table_name": _SQL_TABLE_NAME_PLACEHOLDER,
+                }
+            })
+            with self.__lock:
+                self.misses += 1
+                self.__bodies[key] = body
+                while len(self.__bodies) > self.max_size:
+                    self.__bodies.popitem(last=False)
+        return body.replace(_NAME_PLACEHOLDER, view["name"], 1).replace(
+            _SQL_TABLE_NAME_PLACEHOLDER, view["sql_table_name"], 1
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of rendered bodies in the cache.
+
+        Returns:
+            int: The number of cached bodies.
+        """  # noqa: E501
+        return len(self.__bodies)
@@ -0,0 +1,121 @@
+"""Persistent cache of table schemas, invalidated by cheap freshness probes."""  # noqa: E501
+
+import json
+import logging
+from typing import Protocol
+
+
+class FreshnessProbe(Protocol):
+    """Lists the version of every table of a dataset in a single call."""
+
+    def get_table_versions(self, dataset_id: str) -> dict[str, str]:
+        """Returns the version of every table of a dataset.
+
+        Args:
+            dataset_id: The full ID of the dataset (e.g., "project.dataset").
+
+        Returns:
+            dict[str, str]: A dictionary mapping the table names to their version,
+                such as their last modification time.
+        """  # noqa: E501
+
+
+class SchemaCache:
+    """Cache of table schemas saved to a JSON file between runs.
+
+    A cached schema is only used once a freshness probe has confirmed that
+    the version of its table did not change since the schema was fetched.
+
+    Attributes:
+        cache_path (str): The path of the JSON file of the cache.
+    """  # noqa: E501
+
+    def __init__(self, cache_path: str) -> None:
+        """Initializes the `SchemaCache` object and loads the cache file if it exists.
+
+        Args:
+            cache_path: The path of the JSON file of the cache.
+        """  # noqa: E501
+        self.cache_path = cache_path
+        self.__entries = {}
+        self.__versions = {}
+        self.__fresh = set()
+        try:
+            with open(cache_path) as file:
+                self.__entries = json.load(file)
+        except FileNotFoundError:
+            logging.debug(f"Schema cache {cache_path} not found, starting empty")
+        except ValueError as e:
+            logging.warning(f"Ignoring invalid schema cache {cache_path}: {e}")
+
+    def refresh(self, table_ids: list[str], probe: FreshnessProbe) -> int:
+        """Probes the versions of the tables, with one call per dataset.
+
+        Args:
+            table_ids: The full IDs of the tables (e.g., "project.dataset.table").
+            probe: The freshness probe listing the versions of the tables of a dataset.
+
+        Returns:
+            int: The number of tables whose cached schema is still fresh.
+        """  # noqa: E501
+        table_ids_by_dataset = {}
+        for table_id in table_ids:
+            dataset_id, _, table_name = table_id.rpartition(".")
+            dataset_tables = table_ids_by_dataset.setdefault(dataset_id, [])
+            dataset_tables.append((table_id, table_name))
+        for dataset_id, dataset_tables in table_ids_by_dataset.items():
+            try:
+                versions = probe.get_table_versions(dataset_id)
+            except Exception as e:
+                logging.warning(f"Failed to probe dataset '{dataset_id}': {e}")
+                versions = {}
+            for table_id, table_name in dataset_tables:
+                version = versions.get(table_name)
+                self.__versions[table_id] = version
+                cached = self.__entries.get(table_id)
+                if version is not None and cached and cached["version"] == version:
+                    self.__fresh.add(table_id)
+                else:
+                    self.__fresh.discard(table_id)
+        fresh = len(self.__fresh.intersection(table_ids))
+        logging.info(
+            f"Probed {len(table_ids_by_dataset)} datasets, {fresh} of "
+            f"{len(table_ids)} cached table schemas are fresh"
+        )
+        return fresh
+
+    def get(self, table_id: str) -> list[dict] | None:
+        """Returns the cached schema of a table if the probe found it fresh.
+
+        Args:
+            table_id: The full ID of the table.
+
+        Returns:
+            list[dict] | None: The fields of the table, or None if it must be fetched.
+        """  # noqa: E501
+        if table_id not in self.__fresh:
+            return None
+        return self.__entries[table_id]["fields"]
+
+    def put(self, table_id: str, fields: list[dict]) -> None:
+        """Stores the schema of a table fetched from the database.
+
+        The schema is stored with the version found by the last probe, and is
+        not stored if the probe did not find the table.
+
+        Args:
+            table_id: The full ID of the table.
+            fields: The fields of the table.
+        """  # noqa: E501
+        version = self.__versions.get(table_id)
+        if version is None:
+            self.__entries.pop(table_id, None)
+            return
+        self.__entries[table_id] = {"version": version, "fields": fields}
+        self.__fresh.add(table_id)
+
+    def save(self) -> None:
+        """Saves the cache to its JSON file."""
+        with open(self.cache_path, "w") as file:
+            json.dump(self.__entries, file, sort_keys=True)
+        logging.debug(f"Saved {len(self.__entries)} table schemas to {self.cache_path}")
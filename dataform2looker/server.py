@@ -0,0 +1,192 @@
+"""Long-running generator serving regeneration requests over a local HTTP API."""  # noqa: E501
+
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dataform2looker.exceptions import TableNotSelectedError
+from dataform2looker.lookml import LookML
+
+
+class RegenerationQueue:
+    """Queues regeneration requests and runs them in batches on a worker thread.
+
+    Tables requested while a batch is running are collected into the next
+    batch, so concurrent requests for the same tables are deduplicated and
+    coalesced into a single regeneration.
+
+    Attributes:
+        lookml (LookML): The warm `LookML` object used to regenerate the views.
+    """  # noqa: E501
+
+    def __init__(self, lookml: LookML) -> None:
+        """Initializes the `RegenerationQueue` object and starts its worker thread.
+
+        Args:
+            lookml: The warm `LookML` object used to regenerate the views.
+        """  # noqa: E501
+        self.lookml = lookml
+        self.__condition = threading.Condition()
+        self.__pending = {}
+        self.__next_batch = 0
+        self.__completed_batch = -1
+        self.__results = {}
+        self.__waiters = {}
+        self.__stopped = False
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+
+    def submit(self, tables: list[str]) -> dict[str, str]:
+        """Queues tables for regeneration and waits until their batch is done.
+
+        Args:
+            tables: A list of full table IDs or view names.
+
+        Returns:
+            dict[str, str]: A dictionary mapping the requested table IDs to their view file.
+
+        Raises:
+            RuntimeError: If the regeneration of the batch failed.
+        """  # noqa: E501
+        table_ids = self.lookml.resolve_table_ids(tables)
+        with self.__condition:
+            self.__pending.update(dict.fromkeys(table_ids))
+            batch = self.__next_batch
+            self.__waiters[batch] = self.__waiters.get(batch, 0) + 1
+            self.__condition.notify_all()
+            while self.__completed_batch < batch:
+                self.__condition.wait()
+            view_files, error = self.__results[batch]
+            self.__waiters[batch] -= 1
+            if not self.__waiters[batch]:
+                del self.__waiters[batch]
+                del self.__results[batch]
+        if error:
+            raise RuntimeError(error)
+        return {table_id: view_files[table_id] for table_id in table_ids}
+
+    def stop(self) -> None:
+        """Stops the worker thread once the pending batch is done."""  # noqa: E501
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+        self.__worker.join()
+
+    def __run(self) -> None:
+        """Regenerates the pending tables batch after batch until stopped."""  # noqa: E501
+        while True:
+            with self.__condition:
+                while not self.__pending and not self.__stopped:
+                    self.__condition.wait()
+                if not self.__pending:
+                    return
+                table_ids = list(self.__pending)
+                self.__pending.clear()
+                batch = self.__next_batch
+                self.__next_batch += 1
+            logging.debug(f"Regenerating batch {batch}: {table_ids}")
+            try:
+                result = (self.lookml.regenerate(table_ids), None)
+            except Exception as e:
+                logging.error(f"Failed to regenerate batch {batch}: {e}")
+                result = ({}, str(e))
+            with self.__condition:
+                self.__results[batch] = result
+                self.__completed_batch = batch
+                self.__condition.notify_all()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of the `GeneratorServer` HTTP API."""
+
+    server: "GeneratorServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Reports the health of the server on `/health`."""
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unknown path"})
+            return
+        self._send_json(
+            HTTPStatus.OK,
+            {"status": "ok", "views": len(self.server.queue.lookml.lookml_templates)},
+        )
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Regenerates the tables listed in the JSON body on `/regenerate`."""
+        if self.path != "/regenerate":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Unknown path"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            tables = json.loads(self.rfile.read(length)).get("tables")
+        except (ValueError, AttributeError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"Invalid body: {e}"})
+            return
+        if not isinstance(tables, list) or not all(
+            isinstance(table, str) for table in tables
+        ):
+            self._send_json(
+                HTTPStatus.BAD_REQUEST,
+                {"error": "Invalid body: 'tables' must be a list of strings"},
+            )
+            return
+        try:
+            view_files = self.server.queue.submit(tables)
+        except TableNotSelectedError as e:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": str(e)})
+            return
+        except RuntimeError as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+            return
+        self._send_json(HTTPStatus.OK, {"views": view_files})
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Sends the access log of the server to the debug log."""
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_json(self, status: HTTPStatus, body: dict) -> None:
+        """Sends a JSON response.
+
+        Args:
+            status: The HTTP status of the response.
+            body: The content of the response.
+        """
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class GeneratorServer(ThreadingHTTPServer):
+    """Local HTTP server keeping a `LookML` object warm between regenerations.
+
+    Endpoints:
+        GET /health: Returns the status of the server and the number of views.
+        POST /regenerate: Regenerates the tables listed in a `{"tables": [...]}` body,
+            given as full table IDs or view names.
+
+    Attributes:
+        queue (RegenerationQueue): The queue running the regeneration requests.
+    """  # noqa: E501
+
+    def __init__(
+        self, lookml: LookML, host: str = "127.0.0.1", port: int = 8765
+    ) -> None:
+        """Initializes the `GeneratorServer` object.
+
+        Args:
+            lookml: The warm `LookML` object used to regenerate the views.
+            host: The address to listen on, only local by default.
+            port: The port to listen on, 0 picks a free port.
+        """  # noqa: E501
+        super().__init__((host, port), _RequestHandler)
+        self.queue = RegenerationQueue(lookml)
+
+    def server_close(self) -> None:
+        """Stops the regeneration queue and closes the server socket."""
+        self.queue.stop()
+        super().server_close()
@@ -0,0 +1,180 @@
+"""Deterministic partitioning of Dataform tables across several generation runs."""  # noqa: E501
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from dataform2looker.exceptions import IncompleteShardsError, InvalidShardError
+
+MANIFEST_PREFIX = "df2looker_manifest"
+
+
+def validate_shard(shard_index: int, shard_count: int) -> None:
+    """Checks that `shard_index` is a valid shard out of `shard_count` shards.
+
+    Args:
+        shard_index: The zero based index of the shard.
+        shard_count: The total number of shards.
+
+    Raises:
+        InvalidShardError: If the shard count or the shard index is out of range.
+    """  # noqa: E501
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise InvalidShardError(shard_index, shard_count)
+
+
+def get_shard(table_id: str, shard_count: int) -> int:
+    """Returns the shard a table belongs to.
+
+    The shard is derived from a hash of the table ID, so it is the same on
+    every machine and every run, regardless of the order of the tables.
+
+    Args:
+        table_id: The full ID of the table (e.g., "project.dataset.table").
+        shard_count: The total number of shards.
+
+    Returns:
+        int: The zero based index of the shard the table belongs to.
+    """  # noqa: E501
+    digest = hashlib.sha256(table_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def filter_table_ids(
+    table_ids: list[str], shard_index: int, shard_count: int
+) -> list[str]:
+    """Keeps only the table IDs that belong to the given shard.
+
+    Args:
+        table_ids: The full list of table IDs.
+        shard_index: The zero based index of the shard to keep.
+        shard_count: The total number of shards.
+
+    Returns:
+        list[str]: The table IDs of the shard, in their original order.
+    """  # noqa: E501
+    validate_shard(shard_index, shard_count)
+    return [
+        table_id
+        for table_id in table_ids
+        if get_shard(table_id, shard_count) == shard_index
+    ]
+
+
+def get_selection_digest(table_ids: list[str]) -> str:
+    """Computes an order independent digest of a selection of table IDs.
+
+    Args:
+        table_ids: The table IDs in the selection.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the sorted table IDs.
+    """  # noqa: E501
+    return hashlib.sha256("\n".join(sorted(table_ids)).encode("utf-8")).hexdigest()
+
+
+def get_manifest_path(
+    target_folder_path: str, shard_index: int, shard_count: int
+) -> Path:
+    """Returns the path of the manifest of a shard.
+
+    Args:
+        target_folder_path: The folder where the views of the shard are saved.
+        shard_index: The zero based index of the shard.
+        shard_count: The total number of shards.
+
+    Returns:
+        Path: The path of the shard manifest.
+    """  # noqa: E501
+    file_name = f"{MANIFEST_PREFIX}.shard-{shard_index}-of-{shard_count}.json"
+    return Path(target_folder_path) / file_name
+
+
+def write_shard_manifest(
+    manifest_path: Path,
+    shard_index: int,
+    shard_count: int,
+    selected_table_ids: list[str],
+    view_files: dict[str, str],
+) -> None:
+    """Writes the manifest describing the output of one shard.
+
+    Args:
+        manifest_path: The path of the manifest file.
+        shard_index: The zero based index of the shard.
+        shard_count: The total number of shards.
+        selected_table_ids: All the table IDs selected before sharding.
+        view_files: A dictionary mapping the table IDs of the shard to their view file.
+    """  # noqa: E501
+    manifest = {
+        "shard_index": shard_index,
+        "shard_count": shard_count,
+        "selection_size": len(selected_table_ids),
+        "selection_digest": get_selection_digest(selected_table_ids),
+        "tables": view_files,
+    }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    logging.debug(f"Created shard manifest {manifest_path}")
+
+
+def merge_shard_manifests(manifest_paths: list[str]) -> dict:
+    """Combines the manifests of all the shards and checks the result is complete.
+
+    Args:
+        manifest_paths: The paths of the shard manifests to merge.
+
+    Returns:
+        dict: The merged manifest, with the same layout as a shard manifest
+            covering every table of the selection.
+
+    Raises:
+        IncompleteShardsError: If the manifests come from different selections,
+            if a shard is missing or duplicated, or if the tables of the shards
+            do not add up to the full selection.
+    """  # noqa: E501
+    manifests = []
+    for manifest_path in manifest_paths:
+        with open(manifest_path) as file:
+            manifests.append(json.load(file))
+    if not manifests:
+        raise IncompleteShardsError("no manifest was provided")
+
+    reference = manifests[0]
+    for key in ["shard_count", "selection_size", "selection_digest"]:
+        if any(manifest[key] != reference[key] for manifest in manifests):
+            raise IncompleteShardsError(f"the manifests have different '{key}'")
+
+    shard_count = reference["shard_count"]
+    shard_indexes = sorted(manifest["shard_index"] for manifest in manifests)
+    if shard_indexes != list(range(shard_count)):
+        raise IncompleteShardsError(
+            f"expected shards {list(range(shard_count))}, got {shard_indexes}"
+        )
+
+    tables = {}
+    for manifest in manifests:
+        duplicated = tables.keys() & manifest["tables"].keys()
+        if duplicated:
+            raise IncompleteShardsError(
+                f"tables {sorted(duplicated)} are in more than one shard"
+            )
+        tables.update(manifest["tables"])
+
+    if (
+        len(tables) != reference["selection_size"]
+        or get_selection_digest(list(tables)) != reference["selection_digest"]
+    ):
+        raise IncompleteShardsError(
+            f"the shards contain {len(tables)} tables, "
+            f"expected {reference['selection_size']}"
+        )
+    logging.info(f"Merged {shard_count} shard manifests with {len(tables)} tables")
+    return {
+        "shard_index": 0,
+        "shard_count": 1,
+        "selection_size": reference["selection_size"],
+        "selection_digest": reference["selection_digest"],
+        "tables": dict(sorted(tables.items())),
+    }
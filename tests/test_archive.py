@@ -0,0 +1,63 @@
+"""This module contains unit tests for the `dataform2looker.archive` module."""  # noqa: E501
+
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from dataform2looker.archive import write_archive
+from dataform2looker.exceptions import UnsupportedArchiveFormatError
+
+my_files = {
+    "first.view.lkml": "view: first {\n}",
+    "second.view.lkml": "view: second {\n}",
+}
+
+
+class TestArchive:
+    """Test class for the `dataform2looker.archive` module."""
+
+    def test_zip(self, tmp_path: Path) -> None:
+        """Tests that the view files are saved into a zip archive."""
+        archive_path = str(tmp_path / "views.zip")
+        write_archive(archive_path, my_files)
+
+        with zipfile.ZipFile(archive_path) as archive:
+            assert {
+                name: archive.read(name).decode("utf-8") for name in archive.namelist()
+            } == my_files
+            for member in archive.infolist():
+                assert member.compress_type == zipfile.ZIP_DEFLATED
+                assert member.external_attr >> 16 == 0o644
+
+    @pytest.mark.parametrize("extension", [".tar", ".tar.gz", ".tgz"])
+    def test_tar(self, tmp_path: Path, extension: str) -> None:
+        """Tests that the view files are saved into a tar archive."""
+        archive_path = str(tmp_path / f"views{extension}")
+        write_archive(archive_path, my_files)
+
+        with tarfile.open(archive_path) as archive:
+            assert {
+                member.name: archive.extractfile(member).read().decode("utf-8")
+                for member in archive.getmembers()
+            } == my_files
+
+    @pytest.mark.parametrize("extension", [".zip", ".tar", ".tar.gz", ".tgz"])
+    def test_deterministic(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, extension: str
+    ) -> None:
+        """Tests that the same view files always produce the same archive."""
+        write_archive(str(tmp_path / f"first{extension}"), my_files)
+        monkeypatch.setattr(time, "time", lambda: 1234567890.0)
+        write_archive(str(tmp_path / f"second{extension}"), my_files)
+
+        assert (tmp_path / f"first{extension}").read_bytes() == (
+            tmp_path / f"second{extension}"
+        ).read_bytes()
+
+    def test_unsupported_format(self, tmp_path: Path) -> None:
+        """Tests that an `UnsupportedArchiveFormatError` is raised for an unknown extension."""  # noqa: E501
+        with pytest.raises(UnsupportedArchiveFormatError):
+            write_archive(str(tmp_path / "views.rar"), my_files)
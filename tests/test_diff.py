@@ -0,0 +1,79 @@
+"""This module contains unit tests for the `dataform2looker.diff` module."""  # noqa: E501
+
+from pathlib import Path
+
+from dataform2looker.diff import diff_view_file
+from dataform2looker.lookml import LookML
+
+my_template = "view: my_table {\n  sql_table_name: project.dataset.my_table ;;\n}\n"
+
+
+class TestDiff:
+    """Test class for the `dataform2looker.diff` module."""
+
+    def test_added(self, tmp_path: Path) -> None:
+        """Tests that a view without a file on disk is reported as added."""
+        change = diff_view_file(
+            str(tmp_path / "my_table.view.lkml"), "my_table.view.lkml", my_template
+        )
+        assert change["status"] == "added"
+        assert change["old_hash"] is None
+        assert "+view: my_table {" in change["diff"]
+
+    def test_unchanged(self, tmp_path: Path) -> None:
+        """Tests that a view identical to its file is reported as unchanged."""
+        (tmp_path / "my_table.view.lkml").write_text(my_template)
+        change = diff_view_file(
+            str(tmp_path / "my_table.view.lkml"), "my_table.view.lkml", my_template
+        )
+        assert change["status"] == "unchanged"
+        assert change["old_hash"] == change["new_hash"]
+        assert "diff" not in change
+
+    def test_modified(self, tmp_path: Path) -> None:
+        """Tests that a view different from its file is reported with a diff."""
+        (tmp_path / "my_table.view.lkml").write_text(
+            my_template.replace("dataset", "other_dataset")
+        )
+        change = diff_view_file(
+            str(tmp_path / "my_table.view.lkml"), "my_table.view.lkml", my_template
+        )
+        assert change["status"] == "modified"
+        assert change["diff"].startswith("--- a/my_table.view.lkml")
+        assert "-  sql_table_name: project.other_dataset.my_table ;;" in change["diff"]
+
+    def test_modified_invalid_utf8(self, tmp_path: Path) -> None:
+        """Tests that a file that is not valid UTF-8 is reported as modified."""
+        (tmp_path / "my_table.view.lkml").write_bytes(b"view: \xff {\n}\n")
+        change = diff_view_file(
+            str(tmp_path / "my_table.view.lkml"), "my_table.view.lkml", my_template
+        )
+        assert change["status"] == "modified"
+        assert "-view: \ufffd {" in change["diff"]
+
+    def test_lookml_dry_run(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that `LookML.diff_lookml_views` reports changes without writing files."""  # noqa: E501
+        my_lookml = LookML(source_json_path, str(tmp_path))
+        my_lookml.save_lookml_views()
+        (tmp_path / "crime.view.lkml").write_text(my_template)
+        files_before = {path: path.read_text() for path in tmp_path.iterdir()}
+
+        changes = my_lookml.diff_lookml_views()
+
+        assert changes["summary"] == {"added": 0, "modified": 1, "unchanged": 1}
+        assert {path: path.read_text() for path in tmp_path.iterdir()} == files_before
+
+    def test_read_only_caches(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that the index and schema caches are not written in read-only mode."""  # noqa: E501
+        copied_json_path = tmp_path / "dataform.json"
+        copied_json_path.write_text(Path(source_json_path).read_text())
+
+        LookML(
+            str(copied_json_path),
+            str(tmp_path),
+            index_cache=True,
+            schema_cache_path=str(tmp_path / "schemas.json"),
+            read_only=True,
+        ).diff_lookml_views()
+
+        assert [path.name for path in tmp_path.iterdir()] == ["dataform.json"]
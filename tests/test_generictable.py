@@ -3,7 +3,10 @@
 import pytest
 
 from dataform2looker.database_mappers import GenericTable
-from dataform2looker.exceptions import UnsupportedDatabaseTypeError
+from dataform2looker.exceptions import (
+    InvalidDescriptionPrecedenceError,
+    UnsupportedDatabaseTypeError,
+)
 
 
 class TestGenericTable:
@@ -63,5 +66,35 @@ class TestGenericTable:
         assert "view" in table_dictionary
         assert "measures" in table_dictionary["view"]
 
+    def test_apply_descriptions(self, my_generic_table: GenericTable) -> None:
+        """Tests that Dataform descriptions are merged with the dataform precedence.
+
+        Verifies that the descriptions are also updated in the `table_dictionary`.
+        """  # noqa: E501
+        my_generic_table.apply_descriptions(
+            {"id": "Dataform id", "unknown_column": "Ignored"}, "dataform"
+        )
+        view = my_generic_table.table_dictionary["view"]
+        assert view["dimensions"][0]["description"] == "Dataform id"
+        assert view["dimension_groups"][0]["description"] == "Creation date"
+
+    def test_apply_descriptions_bigquery_precedence(
+        self, my_generic_table: GenericTable
+    ) -> None:
+        """Tests that Dataform descriptions only fill empty ones with the bigquery precedence."""  # noqa: E501
+        my_generic_table.dimensions[0]["description"] = ""
+        my_generic_table.apply_descriptions(
+            {"id": "Dataform id", "created_at": "Dataform date"}, "bigquery"
+        )
+        assert my_generic_table.dimensions[0]["description"] == "Dataform id"
+        assert my_generic_table.dimension_group[0]["description"] == "Creation date"
+
+    def test_apply_descriptions_invalid_precedence(
+        self, my_generic_table: GenericTable
+    ) -> None:
+        """Tests that an `InvalidDescriptionPrecedenceError` is raised for an unknown precedence."""  # noqa: E501
+        with pytest.raises(InvalidDescriptionPrecedenceError):
+            my_generic_table.apply_descriptions({}, "looker")
+
 
 # TODO add tests to check the table_dictionary
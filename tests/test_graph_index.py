@@ -0,0 +1,122 @@
+"""This module contains unit tests for the `GraphIndex` class from the `dataform2looker.graph_index` module."""  # noqa: E501
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from dataform2looker.graph_index import GraphIndex
+
+
+def _table(schema: str, name: str, tags: list[str], columns: list = None) -> dict:
+    """Builds a table of a compiled Dataform graph.
+
+    Returns:
+        dict: The table with its target, tags and documented columns.
+    """
+    return {
+        "target": {"database": "project", "schema": schema, "name": name},
+        "tags": tags,
+        "actionDescriptor": {"columns": columns or []},
+    }
+
+
+my_compiled_graph = {
+    "tables": [
+        _table("sales", "orders", ["daily", "finance"]),
+        _table(
+            "sales",
+            "customers",
+            ["daily"],
+            [
+                {"path": ["id"], "description": "Customer id"},
+                {"path": ["address", "city"], "description": "City"},
+                {"path": ["name"]},
+            ],
+        ),
+        _table("marketing", "campaigns", ["weekly", "finance"]),
+        _table("staging", "raw_orders", []),
+    ]
+}
+
+
+class TestGraphIndex:
+    """Test class for the `GraphIndex` class."""
+
+    @pytest.fixture()
+    def my_index(self) -> GraphIndex:
+        """Creates a `GraphIndex` object for testing.
+
+        Returns:
+            GraphIndex: The index of a small compiled graph.
+        """
+        return GraphIndex.from_compiled_graph(my_compiled_graph)
+
+    def test_init(self, my_index: GraphIndex) -> None:
+        """Tests that the tables are indexed by tag, schema, database and name."""
+        assert my_index.table_ids[0] == "project.sales.orders"
+        assert my_index.tables_by_tag["finance"] == {
+            "project.sales.orders",
+            "project.marketing.campaigns",
+        }
+        assert len(my_index.tables_by_schema["sales"]) == 2
+        assert len(my_index.tables_by_database["project"]) == 4
+        assert my_index.tables_by_name["raw_orders"] == {"project.staging.raw_orders"}
+
+    def test_column_descriptions(self, my_index: GraphIndex) -> None:
+        """Tests that the Dataform column descriptions are indexed by column path."""
+        assert my_index.column_descriptions == {
+            "project.sales.customers": {"id": "Customer id", "address.city": "City"}
+        }
+
+    def test_select(self, my_index: GraphIndex) -> None:
+        """Tests the selection of tables with tag and schema filters."""
+        assert my_index.select() == my_index.table_ids
+        assert my_index.select(tags={"daily", "weekly"}) == [
+            "project.sales.orders",
+            "project.sales.customers",
+            "project.marketing.campaigns",
+        ]
+        assert my_index.select(required_tags={"daily", "finance"}) == [
+            "project.sales.orders"
+        ]
+        assert my_index.select(tags={"daily"}, excluded_tags={"finance"}) == [
+            "project.sales.customers"
+        ]
+        assert my_index.select(excluded_schemas={"sales", "staging"}) == [
+            "project.marketing.campaigns"
+        ]
+        assert my_index.select(schemas={"staging"}, tags={"daily"}) == []
+
+    def test_index_cache(self, tmp_path: Path) -> None:
+        """Tests that the saved index is reused until the source JSON file changes."""
+        source_json_path = tmp_path / "dataform.json"
+        source_json_path.write_text(json.dumps(my_compiled_graph))
+        index_path = tmp_path / "dataform.json.df2looker-index.json"
+
+        GraphIndex.load(str(source_json_path), use_cache=True)
+        assert index_path.is_file()
+        cached = json.loads(index_path.read_text())
+        cached["table_tags"]["project.sales.orders"] = ["cached"]
+        index_path.write_text(json.dumps(cached))
+        assert GraphIndex.load(str(source_json_path), use_cache=True).select(
+            tags={"cached"}
+        ) == ["project.sales.orders"]
+
+        source_json_path.write_text(
+            json.dumps({"tables": my_compiled_graph["tables"][:1]})
+        )
+        assert GraphIndex.load(str(source_json_path), use_cache=True).table_ids == [
+            "project.sales.orders"
+        ]
+
+    def test_no_index_cache(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that the index is not saved unless the cache is enabled."""
+        copied_json_path = tmp_path / "dataform.json"
+        shutil.copy(source_json_path, copied_json_path)
+
+        index = GraphIndex.load(str(copied_json_path))
+
+        assert len(index.table_ids) == 2
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["dataform.json"]
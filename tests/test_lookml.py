@@ -1,7 +1,17 @@
 """This module contains unit tests for the `LookML` class from the `dataform2looker.lookml` module."""  # noqa: E501
 
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import lkml
 import pytest
 
+from dataform2looker.exceptions import (
+    DuplicateViewNameError,
+    InvalidDescriptionPrecedenceError,
+    UnsupportedBundleTypeError,
+)
 from dataform2looker.lookml import LookML
 
 
@@ -43,6 +53,33 @@ class TestLookML:
         assert len(my_lookml_tag.lookml_templates) == 1
         assert my_lookml_tag.db_type == "bigquery"
 
+    def test_selection_filters(self, source_json_path: str) -> None:
+        """Tests that tables are selected with tag and schema exclusions."""
+        my_lookml = LookML(source_json_path, "unused", excluded_tags=["tag1"])
+        assert list(my_lookml.lookml_templates) == [
+            "bigquery-public-data.chicago_crime.crime"
+        ]
+
+        my_lookml = LookML(
+            source_json_path, "unused", excluded_schemas=["chicago_crime"]
+        )
+        assert list(my_lookml.lookml_templates) == [
+            "bigquery-public-data.chicago_taxi_trips.taxi_trips"
+        ]
+
+    def test_schema_cache(
+        self, source_json_path: str, tmp_path: Path, mock_bigquery_client: MagicMock
+    ) -> None:
+        """Tests that the datasets are probed once each and the schema cache is saved."""  # noqa: E501
+        cache_path = tmp_path / "schemas.json"
+        my_lookml = LookML(
+            source_json_path, str(tmp_path), schema_cache_path=str(cache_path)
+        )
+
+        assert len(my_lookml.lookml_templates) == 2
+        assert mock_bigquery_client.query.call_count == 2
+        assert cache_path.is_file()
+
     def test_measure_generation(self, my_lookml: LookML) -> None:
         """Tests the initialization of a `LookML` object.
 
@@ -58,5 +95,86 @@ class TestLookML:
                 in view.strip()
             )
 
+    def test_bundle_by_dataset(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that the views are bundled in one file per dataset.
+
+        Verifies that each bundled file can be parsed back into its views.
+        """  # noqa: E501
+        my_lookml = LookML(source_json_path, str(tmp_path), bundle_by="dataset")
+        my_lookml.save_lookml_views()
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "chicago_crime.view.lkml",
+            "chicago_taxi_trips.view.lkml",
+        ]
+        views = lkml.load((tmp_path / "chicago_crime.view.lkml").read_text())["views"]
+        assert [view["name"] for view in views] == ["crime"]
+
+    @pytest.fixture()
+    def same_names_json_path(self, tmp_path: Path) -> str:
+        """Writes a Dataform JSON file with two tables named `orders` in different schemas.
+
+        Returns:
+            str: The path of the Dataform JSON file.
+        """  # noqa: E501
+        source_json_path = tmp_path / "dataform.json"
+        source_json_path.write_text(
+            json.dumps({
+                "tables": [
+                    {
+                        "target": {"database": "p", "schema": schema, "name": "orders"},
+                        "tags": ["orders"],
+                    }
+                    for schema in ["dev", "prod"]
+                ]
+            })
+        )
+        return str(source_json_path)
+
+    @pytest.mark.parametrize("bundle_by", [None, "tag"])
+    def test_duplicate_view_names(
+        self, same_names_json_path: str, bundle_by: str | None
+    ) -> None:
+        """Tests that a `DuplicateViewNameError` is raised for views saved in the same file."""  # noqa: E501
+        with pytest.raises(DuplicateViewNameError):
+            LookML(same_names_json_path, "unused", bundle_by=bundle_by)
+        with pytest.raises(DuplicateViewNameError):
+            LookML(same_names_json_path, "unused", shard_index=0, shard_count=2)
+
+    def test_bundle_same_table_names(
+        self, same_names_json_path: str, tmp_path: Path
+    ) -> None:
+        """Tests that tables with the same name in different datasets keep their own view."""  # noqa: E501
+        source_json_path = same_names_json_path
+        my_lookml = LookML(source_json_path, str(tmp_path), bundle_by="dataset")
+        view_files = my_lookml.get_view_files()
+
+        assert sorted(view_files) == ["dev.view.lkml", "prod.view.lkml"]
+        for schema in ["dev", "prod"]:
+            views = lkml.load(view_files[f"{schema}.view.lkml"])["views"]
+            assert [view["sql_table_name"] for view in views] == [f"p.{schema}.orders"]
+
+    def test_bundle_by_tag(self, source_json_path: str) -> None:
+        """Tests that the views are bundled in one file per tag."""
+        my_lookml = LookML(source_json_path, "unused", bundle_by="tag")
+
+        assert sorted(my_lookml.get_view_files()) == [
+            "tag1.view.lkml",
+            "tag2.view.lkml",
+        ]
+
+    def test_unsupported_bundle(self, source_json_path: str) -> None:
+        """Tests that an `UnsupportedBundleTypeError` is raised for an unknown bundle type."""  # noqa: E501
+        with pytest.raises(UnsupportedBundleTypeError):
+            LookML(source_json_path, "unused", bundle_by="schema")
+
+    def test_invalid_description_precedence(
+        self, source_json_path: str, mock_bigquery_client: MagicMock
+    ) -> None:
+        """Tests that an invalid description precedence fails before any schema is fetched."""  # noqa: E501
+        with pytest.raises(InvalidDescriptionPrecedenceError):
+            LookML(source_json_path, "unused", description_precedence="looker")
+        mock_bigquery_client.get_table.assert_not_called()
+
 
 # TODO include a test for the generated template
@@ -0,0 +1,299 @@
+"""This module contains unit tests for the `dataform2looker.merge` module."""  # noqa: E501
+
+from pathlib import Path
+
+import lkml
+
+from dataform2looker.lookml import LookML
+from dataform2looker.merge import (
+    GENERATED_HASH_MARKER,
+    merge_view,
+    merge_view_files,
+    read_generated_hash,
+    save_merged_view_file,
+)
+
+my_generated_view = {
+    "name": "my_table",
+    "sql_table_name": "project.dataset.my_table",
+    "dimensions": [
+        {
+            "name": "id",
+            "type": "string",
+            "description": "Primary Key",
+            "sql": "${TABLE}.id",
+        },
+        {
+            "name": "new_column",
+            "type": "number",
+            "description": "",
+            "sql": "${TABLE}.new_column",
+        },
+    ],
+    "measures": [{"type": "count", "name": "count"}],
+}
+
+my_existing_view = """view: my_table {
+  sql_table_name: project.old_dataset.my_table ;;
+  label: "My Table"
+
+  dimension: id {
+    type: number
+    description: "Old description"
+    hidden: yes
+    sql: ${TABLE}.id ;;
+  }
+
+  dimension: removed_column {
+    type: string
+    sql: ${TABLE}.removed_column ;;
+  }
+
+  dimension: id_label {
+    type: string
+    sql: CONCAT('#', ${id}) ;;
+  }
+
+  measure: total {
+    type: sum
+    sql: ${TABLE}.amount ;;
+  }
+}
+"""
+
+
+class TestMerge:
+    """Test class for the `dataform2looker.merge` module."""
+
+    def test_merge_view(self) -> None:
+        """Tests that the generated fields are updated and the hand-written ones kept."""  # noqa: E501
+        existing_view = lkml.load(my_existing_view)["views"][0]
+        merged_view = merge_view(
+            existing_view,
+            my_generated_view,
+            dict.fromkeys(["id", "removed_column", "count"], {}),
+        )
+
+        assert merged_view["label"] == "My Table"
+        assert merged_view["sql_table_name"] == "project.dataset.my_table"
+        dimensions = {field["name"]: field for field in merged_view["dimensions"]}
+        assert list(dimensions) == ["id", "id_label", "new_column"]
+        assert dimensions["id"]["type"] == "string"
+        assert dimensions["id"]["description"] == "Primary Key"
+        assert dimensions["id"]["hidden"] == "yes"
+        assert [field["name"] for field in merged_view["measures"]] == [
+            "total",
+            "count",
+        ]
+
+    def test_merge_view_keeps_hand_written_values(self) -> None:
+        """Tests that values edited by hand are only replaced when their generated value changes."""  # noqa: E501
+        existing_view = {
+            "name": "my_table",
+            "dimensions": [
+                {
+                    "name": "id",
+                    "type": "string",
+                    "description": "Hand written doc",
+                    "sql": "${TABLE}.id",
+                },
+                {
+                    "name": "new_column",
+                    "type": "number",
+                    "description": "Hand written doc",
+                    "sql": "${TABLE}.new_column",
+                },
+            ],
+        }
+        previous_id = {**my_generated_view["dimensions"][0], "type": "number"}
+        merged_view = merge_view(existing_view, my_generated_view, {"id": previous_id})
+
+        dimensions = {field["name"]: field for field in merged_view["dimensions"]}
+        assert dimensions["id"]["description"] == "Hand written doc"
+        assert dimensions["id"]["type"] == "string"
+        # Without previous values, an empty description never replaces one
+        assert dimensions["new_column"]["description"] == "Hand written doc"
+
+    def test_merge_view_keeps_hand_written_column_fields(self) -> None:
+        """Tests that hand-written fields named after their column are never dropped."""  # noqa: E501
+        existing_view = {
+            "name": "my_table",
+            "dimensions": [{"name": "note", "type": "string", "sql": "${TABLE}.note"}],
+            "measures": [{"name": "amount", "type": "sum", "sql": "${TABLE}.amount"}],
+        }
+        merged_view = merge_view(
+            existing_view, my_generated_view, dict.fromkeys(["id", "count"], {})
+        )
+
+        assert [field["name"] for field in merged_view["dimensions"]] == [
+            "note",
+            "id",
+            "new_column",
+        ]
+        assert [field["name"] for field in merged_view["measures"]] == [
+            "amount",
+            "count",
+        ]
+
+    def test_merge_view_files(self, tmp_path: Path) -> None:
+        """Tests that view files are merged once and skipped while up to date."""
+        file_path = str(tmp_path / "my_table.view.lkml")
+        (tmp_path / "my_table.view.lkml").write_text(my_existing_view)
+        view_files = {file_path: {"view": my_generated_view}}
+
+        merged_content = merge_view_files(view_files, max_workers=1)[file_path]
+        assert merged_content.startswith(GENERATED_HASH_MARKER)
+        (tmp_path / "my_table.view.lkml").write_text(merged_content)
+
+        assert read_generated_hash(file_path) is not None
+        assert merge_view_files(view_files, max_workers=1) == {file_path: None}
+
+    def test_lookml_merge(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that `LookML.merge_lookml_views` creates and then keeps view files."""  # noqa: E501
+        my_lookml = LookML(source_json_path, str(tmp_path))
+
+        assert my_lookml.merge_lookml_views(max_workers=1) == {
+            "merged": 2,
+            "unchanged": 0,
+            "failed": 0,
+        }
+        views = lkml.load((tmp_path / "crime.view.lkml").read_text())["views"]
+        assert views[0]["name"] == "crime"
+        assert my_lookml.merge_lookml_views(max_workers=1) == {
+            "merged": 0,
+            "unchanged": 2,
+            "failed": 0,
+        }
+
+    def test_merge_view_removes_empty_field_types(self) -> None:
+        """Tests that a field type is removed when none of its fields are kept."""
+        existing_view = {
+            "name": "my_table",
+            "dimension_groups": [
+                {
+                    "name": "created_at",
+                    "type": "time",
+                    "sql": "${TABLE}.created_at",
+                }
+            ],
+        }
+        merged_view = merge_view(existing_view, my_generated_view, {"created_at": {}})
+
+        assert "dimension_groups" not in merged_view
+
+    def test_merge_view_files_drops_removed_generated_fields(
+        self, tmp_path: Path
+    ) -> None:
+        """Tests that only the fields generated by the previous merge are dropped."""  # noqa: E501
+        file_path = str(tmp_path / "my_table.view.lkml")
+        merged_content = merge_view_files(
+            {file_path: {"view": my_generated_view}}, max_workers=1
+        )[file_path]
+        assert merged_content.splitlines()[0].endswith(" id,new_column,count")
+        (tmp_path / "my_table.view.lkml").write_text(
+            merged_content.replace(
+                "}\n}",
+                "}\n  measure: amount {\n    type: sum\n"
+                "    sql: ${TABLE}.amount ;;\n  }\n}",
+            )
+        )
+
+        generated_view = {
+            **my_generated_view,
+            "dimensions": my_generated_view["dimensions"][:1],
+        }
+        merged_content = merge_view_files(
+            {file_path: {"view": generated_view}}, max_workers=1
+        )[file_path]
+        merged_view = lkml.load(merged_content)["views"][0]
+        assert [field["name"] for field in merged_view["dimensions"]] == ["id"]
+        assert [field["name"] for field in merged_view["measures"]] == [
+            "count",
+            "amount",
+        ]
+
+    def test_merge_view_files_skips_invalid_files(self, tmp_path: Path) -> None:
+        """Tests that a view file that can not be parsed is skipped, not fatal."""
+        invalid_path = str(tmp_path / "invalid.view.lkml")
+        (tmp_path / "invalid.view.lkml").write_text("view: invalid {\n")
+        binary_path = str(tmp_path / "binary.view.lkml")
+        (tmp_path / "binary.view.lkml").write_bytes(b"\xff\xfe")
+        file_path = str(tmp_path / "my_table.view.lkml")
+        view_files = {
+            invalid_path: {"view": my_generated_view},
+            binary_path: {"view": my_generated_view},
+            file_path: {"view": my_generated_view},
+        }
+
+        merged_files = merge_view_files(view_files, max_workers=1)
+
+        assert list(merged_files) == [file_path]
+        assert (tmp_path / "invalid.view.lkml").read_text() == "view: invalid {\n"
+
+    def test_merge_view_files_with_state(self, tmp_path: Path) -> None:
+        """Tests that the state of the last merge keeps the values edited by hand."""
+        file_path = str(tmp_path / "my_table.view.lkml")
+        table_dictionary = {"view": my_generated_view}
+        content = merge_view_files({file_path: table_dictionary}, max_workers=1)[
+            file_path
+        ]
+        save_merged_view_file(file_path, content, table_dictionary)
+        assert (tmp_path / ".df2looker" / "my_table.view.lkml.json").is_file()
+        (tmp_path / "my_table.view.lkml").write_text(
+            content.replace('description: "Primary Key"', 'description: "Edited"')
+        )
+
+        generated_view = {
+            **my_generated_view,
+            "dimensions": [
+                {**my_generated_view["dimensions"][0], "type": "number"},
+                my_generated_view["dimensions"][1],
+            ],
+        }
+        content = merge_view_files(
+            {file_path: {"view": generated_view}}, max_workers=1
+        )[file_path]
+        dimension = lkml.load(content)["views"][0]["dimensions"][0]
+        assert dimension["description"] == "Edited"
+        assert dimension["type"] == "number"
+
+    def test_first_merge_of_generated_file(self, tmp_path: Path) -> None:
+        """Tests that the first merge of a file written without merge drops removed columns."""  # noqa: E501
+        file_path = str(tmp_path / "my_table.view.lkml")
+        (tmp_path / "my_table.view.lkml").write_text(my_existing_view)
+
+        content = merge_view_files(
+            {file_path: {"view": my_generated_view}}, max_workers=1
+        )[file_path]
+        merged_view = lkml.load(content)["views"][0]
+        assert [field["name"] for field in merged_view["dimensions"]] == [
+            "id",
+            "id_label",
+            "new_column",
+        ]
+        assert [field["name"] for field in merged_view["measures"]] == [
+            "total",
+            "count",
+        ]
+
+    def test_merge_keeps_comments(self, tmp_path: Path) -> None:
+        """Tests that the comments of a merged view file are kept."""
+        file_path = str(tmp_path / "my_table.view.lkml")
+        (tmp_path / "my_table.view.lkml").write_text(
+            "# my important note\n"
+            + my_existing_view.replace(
+                "  dimension: id {\n", "  # id note\n  dimension: id {\n    # inner\n"
+            ).replace("  measure: total", "  # hand measure\n  measure: total")
+        )
+
+        content = merge_view_files(
+            {file_path: {"view": my_generated_view}}, max_workers=1
+        )[file_path]
+        for comment in [
+            "# my important note",
+            "# id note",
+            "# inner",
+            "# hand measure",
+        ]:
+            assert comment in content
+        assert lkml.load(content)["views"][0]["dimensions"][0]["type"] == "string"
@@ -0,0 +1,54 @@
+"""This module contains unit tests for the `Profiler` class from the `dataform2looker.profiling` module."""  # noqa: E501
+
+import csv
+from pathlib import Path
+
+from dataform2looker.lookml import LookML
+from dataform2looker.profiling import Profiler
+
+
+class TestProfiler:
+    """Test class for the `Profiler` class."""
+
+    def test_measure(self) -> None:
+        """Tests that a stage records its time, its allocation peak and its stack."""
+        profiler = Profiler()
+        with profiler.measure("p.d.t", "render"):
+            data = [bytearray(1024) for _ in range(100)]
+        profiler.stop()
+
+        record = profiler.records["p.d.t"]
+        assert record["render_ms"] > 0
+        assert record["peak_bytes"] >= 100 * 1024
+        assert list(profiler.stacks) == ["df2looker;render;p.d.t"]
+        assert len(data) == 100
+
+    def test_lookml_profile(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that `LookML` records the cost of each table.
+
+        Verifies that the report is sorted and the stacks are in the folded format.
+        """  # noqa: E501
+        profiler = Profiler()
+        LookML(source_json_path, str(tmp_path), profiler=profiler)
+        profiler.stop()
+
+        assert len(profiler.records) == 2
+        for record in profiler.records.values():
+            assert record["columns"] == 2
+            assert record["output_bytes"] > 0
+            assert "fetch_ms" in record
+            assert "render_ms" in record
+
+        profiler.write_report(str(tmp_path / "profile.csv"), "output_bytes")
+        with open(tmp_path / "profile.csv") as f:
+            rows = list(csv.DictReader(f))
+        assert [int(row["output_bytes"]) for row in rows] == sorted(
+            (int(row["output_bytes"]) for row in rows), reverse=True
+        )
+
+        profiler.write_stacks(str(tmp_path / "profile.folded"))
+        lines = (tmp_path / "profile.folded").read_text().splitlines()
+        assert len(lines) == 4
+        stack, microseconds = lines[0].rsplit(" ", 1)
+        assert stack.startswith("df2looker;")
+        assert microseconds.isdigit()
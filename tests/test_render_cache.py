@@ -0,0 +1,88 @@
+"""This module contains unit tests for the `RenderCache` class from the `dataform2looker.render_cache` module."""  # noqa: E501
+
+import copy
+
+import lkml
+
+from dataform2looker.render_cache import RenderCache
+
+my_table_dictionary = {
+    "view": {
+        "name": "orders",
+        "sql_table_name": "project.dev_dataset.orders",
+        "dimensions": [
+            {
+                "name": "id",
+                "type": "string",
+                "description": "Primary Key",
+                "sql": "${TABLE}.id",
+            }
+        ],
+        "dimension_groups": [],
+        "measures": [{"type": "count", "name": "count"}],
+    }
+}
+
+
+def _table_dictionary(name: str, sql_table_name: str) -> dict:
+    """Copies the test table dictionary with another name and table.
+
+    Returns:
+        dict: The LookML dictionary of the view.
+    """
+    table_dictionary = copy.deepcopy(my_table_dictionary)
+    table_dictionary["view"]["name"] = name
+    table_dictionary["view"]["sql_table_name"] = sql_table_name
+    return table_dictionary
+
+
+class TestRenderCache:
+    """Test class for the `RenderCache` class."""
+
+    def test_render_matches_lkml(self) -> None:
+        """Tests that cache hits render the same views as `lkml.dump`."""
+        cache = RenderCache()
+        prod_table = _table_dictionary("orders", "project.prod_dataset.orders")
+
+        assert cache.render(my_table_dictionary) == lkml.dump(my_table_dictionary)
+        assert cache.render(prod_table) == lkml.dump(prod_table)
+        assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    def test_key_ignores_name_and_table(self) -> None:
+        """Tests that only the content of the view is part of the cache key."""
+        other_table = copy.deepcopy(my_table_dictionary)
+        other_table["view"]["dimensions"][0]["description"] = "Other"
+
+        assert RenderCache.get_key(my_table_dictionary) == RenderCache.get_key(
+            _table_dictionary("other", "project.dataset.other")
+        )
+        assert RenderCache.get_key(my_table_dictionary) != RenderCache.get_key(
+            other_table
+        )
+
+    def test_lru_eviction(self) -> None:
+        """Tests that the least recently used body is evicted first."""
+        cache = RenderCache(max_size=2)
+        tables = []
+        for description in ["a", "b", "c"]:
+            table = copy.deepcopy(my_table_dictionary)
+            table["view"]["dimensions"][0]["description"] = description
+            tables.append(table)
+
+        cache.render(tables[0])
+        cache.render(tables[1])
+        cache.render(tables[0])
+        cache.render(tables[2])
+        assert len(cache) == 2
+        cache.render(tables[0])
+        assert cache.hits == 2
+        cache.render(tables[1])
+        assert cache.misses == 4
+
+    def test_disabled(self) -> None:
+        """Tests that a cache of size 0 keeps nothing."""
+        cache = RenderCache(max_size=0)
+        cache.render(my_table_dictionary)
+        cache.render(my_table_dictionary)
+
+        assert (cache.hits, cache.misses, len(cache)) == (0, 2, 0)
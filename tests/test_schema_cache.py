@@ -0,0 +1,72 @@
+"""This module contains unit tests for the `SchemaCache` class from the `dataform2looker.schema_cache` module."""  # noqa: E501
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from dataform2looker.database_mappers import BigQueryTable
+from dataform2looker.schema_cache import SchemaCache
+
+my_fields = [{"name": "id", "description": "Primary Key", "field_type": "STRING"}]
+
+
+class _FakeProbe:
+    """Fake freshness probe returning fixed table versions."""
+
+    def __init__(self, versions: dict[str, dict[str, str]]) -> None:
+        """Initializes the fake with the table versions of each dataset."""
+        self.versions = versions
+        self.calls = []
+
+    def get_table_versions(self, dataset_id: str) -> dict[str, str]:
+        """Records the call and returns the table versions of the dataset.
+
+        Returns:
+            dict[str, str]: The versions of the tables of the dataset.
+        """
+        self.calls.append(dataset_id)
+        return self.versions.get(dataset_id, {})
+
+
+class TestSchemaCache:
+    """Test class for the `SchemaCache` class."""
+
+    def test_refresh(self, tmp_path: Path) -> None:
+        """Tests that tables are probed once per dataset and unchanged ones are fresh."""  # noqa: E501
+        cache_path = str(tmp_path / "schemas.json")
+        table_ids = ["p.d1.a", "p.d1.b", "p.d2.c"]
+        probe = _FakeProbe({"p.d1": {"a": "1", "b": "1"}, "p.d2": {"c": "1"}})
+
+        cache = SchemaCache(cache_path)
+        assert cache.refresh(table_ids, probe) == 0
+        for table_id in table_ids:
+            cache.put(table_id, my_fields)
+        cache.save()
+
+        probe = _FakeProbe({"p.d1": {"a": "1", "b": "2"}, "p.d2": {"c": "1"}})
+        cache = SchemaCache(cache_path)
+        assert cache.refresh(table_ids, probe) == 2
+        assert sorted(probe.calls) == ["p.d1", "p.d2"]
+        assert cache.get("p.d1.a") == my_fields
+        assert cache.get("p.d1.b") is None
+
+    def test_unprobed_table(self, tmp_path: Path) -> None:
+        """Tests that a table the probe does not find is neither used nor stored."""
+        cache = SchemaCache(str(tmp_path / "schemas.json"))
+        cache.refresh(["p.d.a"], _FakeProbe({}))
+        cache.put("p.d.a", my_fields)
+
+        assert cache.get("p.d.a") is None
+
+    def test_bigquery_table_skips_fresh_schema(
+        self, tmp_path: Path, mock_bigquery_client: MagicMock
+    ) -> None:
+        """Tests that `BigQueryTable` only downloads the schemas that changed."""
+        cache = SchemaCache(str(tmp_path / "schemas.json"))
+        cache.refresh(["p.d.a"], _FakeProbe({"p.d": {"a": "1"}}))
+        BigQueryTable("p.d.a", mock_bigquery_client, cache)
+        assert mock_bigquery_client.get_table.call_count == 1
+
+        cache.refresh(["p.d.a"], _FakeProbe({"p.d": {"a": "1"}}))
+        table = BigQueryTable("p.d.a", mock_bigquery_client, cache)
+        assert mock_bigquery_client.get_table.call_count == 1
+        assert [column.name for column in table.columns] == ["id", "created_at"]
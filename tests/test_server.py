@@ -0,0 +1,141 @@
+"""This module contains unit tests for the `dataform2looker.server` module."""  # noqa: E501
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from dataform2looker.dataform2looker import main
+from dataform2looker.lookml import LookML
+from dataform2looker.server import GeneratorServer, RegenerationQueue
+
+
+class _SlowLookML:
+    """Fake `LookML` object recording the batches it regenerates."""
+
+    def __init__(self) -> None:
+        """Initializes the fake with no regenerated batch."""
+        self.batches = []
+
+    def resolve_table_ids(self, tables: list[str]) -> list[str]:
+        """Returns the tables unchanged.
+
+        Returns:
+            list[str]: The tables without duplicates.
+        """
+        return list(dict.fromkeys(tables))
+
+    def regenerate(self, table_ids: list[str]) -> dict[str, str]:
+        """Records the batch and takes some time to regenerate it.
+
+        Returns:
+            dict[str, str]: A fake view file for each table.
+        """
+        self.batches.append(sorted(table_ids))
+        time.sleep(0.2)
+        return {table_id: f"{table_id}.view.lkml" for table_id in table_ids}
+
+
+class TestGeneratorServer:
+    """Test class for the `GeneratorServer` and `RegenerationQueue` classes."""
+
+    @pytest.fixture()
+    def my_server(
+        self, source_json_path: str, tmp_path: Path
+    ) -> Iterator[GeneratorServer]:
+        """Starts a `GeneratorServer` on a free local port.
+
+        Yields:
+            GeneratorServer: The running server.
+        """
+        server = GeneratorServer(LookML(source_json_path, str(tmp_path)), port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def _post(self, server: GeneratorServer, body: dict) -> tuple[int, dict]:
+        """Sends a regeneration request to the server.
+
+        Returns:
+            tuple[int, dict]: The HTTP status and the JSON content of the response.
+        """
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/regenerate",
+            data=json.dumps(body).encode("utf-8"),
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_regenerate(self, my_server: GeneratorServer, tmp_path: Path) -> None:
+        """Tests that a request regenerates and saves the requested views."""
+        status, content = self._post(my_server, {"tables": ["crime"]})
+
+        assert status == 200
+        assert list(content["views"]) == ["bigquery-public-data.chicago_crime.crime"]
+        assert (tmp_path / "crime.view.lkml").is_file()
+        assert not (tmp_path / "taxi_trips.view.lkml").exists()
+
+    def test_unknown_table(self, my_server: GeneratorServer) -> None:
+        """Tests that a request for a table outside the selection is rejected."""
+        status, _ = self._post(my_server, {"tables": ["unknown_table"]})
+        assert status == 404
+
+        status, _ = self._post(my_server, {"tables": "crime"})
+        assert status == 400
+
+    def test_invalid_table_items(self, my_server: GeneratorServer) -> None:
+        """Tests that a request listing tables that are not strings is rejected."""
+        for tables in [[["crime"]], [{"name": "crime"}], ["crime", 1]]:
+            status, content = self._post(my_server, {"tables": tables})
+            assert status == 400
+            assert "list of strings" in content["error"]
+
+    def test_requests_are_coalesced(self) -> None:
+        """Tests that requests queued during a regeneration share the next batch.
+
+        Verifies that duplicated tables are only regenerated once per batch.
+        """  # noqa: E501
+        lookml = _SlowLookML()
+        queue = RegenerationQueue(lookml)
+        results = {}
+
+        def submit(name: str, tables: list[str]) -> None:
+            results[name] = queue.submit(tables)
+
+        first = threading.Thread(target=submit, args=("first", ["a"]))
+        first.start()
+        time.sleep(0.05)
+        others = [
+            threading.Thread(target=submit, args=(f"other_{i}", ["b", "c"]))
+            for i in range(3)
+        ]
+        for thread in others:
+            thread.start()
+        for thread in [first, *others]:
+            thread.join()
+        queue.stop()
+
+        assert lookml.batches == [["a"], ["b", "c"]]
+        assert results["other_0"] == {"b": "b.view.lkml", "c": "c.view.lkml"}
+
+    @pytest.mark.parametrize(
+        "option",
+        [["--merge"], ["--archive", "views.zip"], ["--dry-run"], ["--profile", "p"]],
+    )
+    def test_serve_incompatible_options(
+        self, source_json_path: str, option: list[str]
+    ) -> None:
+        """Tests that serve mode rejects the options it does not support."""
+        with pytest.raises(SystemExit):
+            main(["--source-file-path", source_json_path, "--serve", *option])
@@ -0,0 +1,124 @@
+"""This module contains unit tests for the `dataform2looker.sharding` module."""  # noqa: E501
+
+from pathlib import Path
+
+import pytest
+
+from dataform2looker.dataform2looker import main
+from dataform2looker.exceptions import (
+    IncompleteShardsError,
+    InvalidShardError,
+    ShardedBundleError,
+)
+from dataform2looker.lookml import LookML
+from dataform2looker.sharding import (
+    filter_table_ids,
+    get_manifest_path,
+    get_shard,
+    merge_shard_manifests,
+)
+
+table_ids = [f"project.dataset.table_{i}" for i in range(50)]
+
+
+class TestSharding:
+    """Test class for the `dataform2looker.sharding` module."""
+
+    def test_get_shard_is_stable(self) -> None:
+        """Tests that a table is always assigned to the same shard."""
+        assert [get_shard(table_id, 4) for table_id in table_ids] == [
+            get_shard(table_id, 4) for table_id in reversed(table_ids)
+        ][::-1]
+        assert all(0 <= get_shard(table_id, 4) < 4 for table_id in table_ids)
+
+    def test_filter_table_ids_partitions(self) -> None:
+        """Tests that the shards are disjoint and cover all the table IDs."""
+        shards = [filter_table_ids(table_ids, index, 3) for index in range(3)]
+        assert sorted(sum(shards, [])) == sorted(table_ids)
+        assert sum(len(shard) for shard in shards) == len(table_ids)
+
+    def test_invalid_shard(self) -> None:
+        """Tests that an `InvalidShardError` is raised for an out of range shard."""
+        with pytest.raises(InvalidShardError):
+            filter_table_ids(table_ids, 3, 3)
+        with pytest.raises(InvalidShardError):
+            filter_table_ids(table_ids, 0, 0)
+
+    def test_shards_match_single_run(
+        self, source_json_path: str, tmp_path: Path
+    ) -> None:
+        """Tests that the shards together generate the same views as a single run.
+
+        Verifies that the merged manifest lists every generated view.
+        """  # noqa: E501
+        single_run = LookML(source_json_path, str(tmp_path))
+        sharded_templates = {}
+        manifest_paths = []
+        for shard_index in range(2):
+            shard = LookML(
+                source_json_path,
+                str(tmp_path),
+                shard_index=shard_index,
+                shard_count=2,
+            )
+            shard.save_lookml_views()
+            sharded_templates.update(shard.lookml_templates)
+            manifest_paths.append(str(get_manifest_path(str(tmp_path), shard_index, 2)))
+
+        assert sharded_templates == single_run.lookml_templates
+        manifest = merge_shard_manifests(manifest_paths)
+        assert sorted(manifest["tables"].values()) == sorted(
+            f"{table_id.split('.')[-1]}.view.lkml"
+            for table_id in single_run.lookml_templates
+        )
+
+    def test_merge_missing_shard(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that an `IncompleteShardsError` is raised when a shard is missing."""  # noqa: E501
+        LookML(
+            source_json_path, str(tmp_path), shard_index=0, shard_count=2
+        ).save_lookml_views()
+
+        with pytest.raises(IncompleteShardsError):
+            merge_shard_manifests([str(get_manifest_path(str(tmp_path), 0, 2))])
+
+    @pytest.mark.parametrize("content", [None, "{", "{}", "[]"])
+    def test_merge_invalid_manifest(self, tmp_path: Path, content: str | None) -> None:
+        """Tests that missing or invalid manifests make the CLI fail without a traceback."""  # noqa: E501
+        manifest_path = tmp_path / "df2looker_manifest.shard-0-of-1.json"
+        if content is not None:
+            manifest_path.write_text(content)
+
+        assert (
+            main([
+                "--merge-manifests",
+                str(manifest_path),
+                "--target-dir",
+                str(tmp_path),
+            ])
+            == 1
+        )
+
+    def test_sharded_bundle(self, source_json_path: str) -> None:
+        """Tests that a `ShardedBundleError` is raised for bundles split into shards."""  # noqa: E501
+        with pytest.raises(ShardedBundleError):
+            LookML(
+                source_json_path,
+                "unused",
+                bundle_by="dataset",
+                shard_index=0,
+                shard_count=2,
+            )
+
+    def test_sharded_archives(self, source_json_path: str, tmp_path: Path) -> None:
+        """Tests that sharded archives save manifests that can be merged."""
+        manifest_paths = []
+        for shard_index in range(2):
+            LookML(
+                source_json_path,
+                str(tmp_path / "unused"),
+                shard_index=shard_index,
+                shard_count=2,
+            ).save_lookml_archive(str(tmp_path / f"views-{shard_index}.zip"))
+            manifest_paths.append(str(get_manifest_path(str(tmp_path), shard_index, 2)))
+
+        assert len(merge_shard_manifests(manifest_paths)["tables"]) == 2